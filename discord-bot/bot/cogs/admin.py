@@ -9,6 +9,7 @@ from discord.ext import commands
 from ..utils.checks import require_manage_guild
 from ..utils.replies import reply_text, reply_error, reply_success
 from ..services.guild_config import get_guild_cfg, update_guild_cfg
+from ..services.vc_overrides import invalidate_vc_override
 from ..db import execute, fetchrow
 from ..utils.timezones import parse_utc_offset_to_minutes, format_utc_offset  # <— NEU
 
@@ -271,8 +272,10 @@ class AdminCog(commands.Cog):
         if module == "vc_override":
             if channel:
                 await execute("DELETE FROM vc_overrides WHERE guild_id=$1 AND channel_id=$2", gid, channel.id)
+                invalidate_vc_override(gid, channel.id)
                 return await reply_success(interaction, f"🗑️ vc_override-Overrides für {channel.mention} wurden entfernt.", ephemeral=True)
             await execute("DELETE FROM vc_overrides WHERE guild_id=$1", gid)
+            invalidate_vc_override(gid)
             return await reply_success(interaction, "🗑️ Alle vc_override-Overrides für diese Guild wurden entfernt.", ephemeral=True)
 
 
@@ -1,5 +1,6 @@
 # bot/cogs/features.py
 from __future__ import annotations
+import asyncio
 import json
 import discord
 from discord import app_commands
@@ -24,7 +25,7 @@ class FeaturesCog(commands.Cog):
 
     @app_commands.command(name="features", description="Zeige die aktuelle Feature-Liste")
     async def features(self, interaction: discord.Interaction):
-        features = load_features()
+        features = await asyncio.to_thread(load_features)  # Datei-I/O nicht auf dem Event-Loop
         if not features:
             return await reply_text(interaction, "Keine Features eingetragen.", ephemeral=True)
 
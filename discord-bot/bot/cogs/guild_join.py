@@ -43,20 +43,34 @@ class WelcomeView(discord.ui.View):
         )
 
 
+# Nur Link-Buttons, kein Timeout → eine gemeinsame Instanz reicht.
+# View() braucht einen laufenden Event-Loop, daher erst bei Bedarf erzeugen.
+_WELCOME_VIEW: WelcomeView | None = None
+
+def _welcome_view() -> WelcomeView:
+    global _WELCOME_VIEW
+    if _WELCOME_VIEW is None:
+        _WELCOME_VIEW = WelcomeView()
+    return _WELCOME_VIEW
+
+
 class GuildJoinCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
 
     @commands.Cog.listener()
     async def on_guild_join(self, guild: discord.Guild):
-        # 0) Ban-Check
-        try:
-            banned = await fetchrow(
-                "SELECT reason FROM public.bot_bans WHERE guild_id=$1",
-                guild.id
-            )
-        except Exception:
-            banned = None
+        # 0) Ban-Check (aus dem Cache von OwnerToolsCog, sonst DB)
+        owner_tools = self.bot.get_cog("OwnerToolsCog")
+        banned = owner_tools.is_banned(guild.id) if owner_tools else None
+        if banned is None:
+            try:
+                banned = await fetchrow(
+                    "SELECT reason FROM public.bot_bans WHERE guild_id=$1",
+                    guild.id
+                ) is not None
+            except Exception:
+                banned = False
 
         if banned:
             try:
@@ -65,8 +79,8 @@ class GuildJoinCog(commands.Cog):
                 pass
             return
 
-        # 1) Features laden
-        features = load_features()
+        # 1) Features laden (Datei-I/O im Thread, blockiert sonst den Event-Loop)
+        features = await asyncio.to_thread(load_features)
         if not features:
             features_text = "Keine Features eingetragen."
         else:
@@ -114,7 +128,7 @@ class GuildJoinCog(commands.Cog):
             )
             try:
                 # DM → tracked_send mit user_id & lang="en"
-                await tracked_send(owner, embed=emb, view=WelcomeView(), user_id=owner.id, lang="en")
+                await tracked_send(owner, embed=emb, view=_welcome_view(), user_id=owner.id, lang="en")
             except discord.Forbidden:
                 try:
                     await reply_text(
@@ -123,7 +137,7 @@ class GuildJoinCog(commands.Cog):
                         kind="warning",
                     )
                     # Kanal-Message mit View → tracked_send (guild_id)
-                    await tracked_send(setup_channel, view=WelcomeView(), guild_id=guild.id)
+                    await tracked_send(setup_channel, view=_welcome_view(), guild_id=guild.id)
                 except Exception:
                     pass
 
@@ -1,35 +1,175 @@
 # bot/cogs/owner_tools.py
 from __future__ import annotations
 import asyncio
+import bisect
+import itertools
 import json
+import logging
+import operator
+import os
+import time
 from pathlib import Path
 import discord
 from discord import app_commands
-from discord.ext import commands
+from discord.ext import commands, tasks
 
 from ..config import settings
 from ..utils.replies import reply_text, send_embed, tracked_send  # ← tracked_send hinzugefügt
 from ..utils.timeutil import translate_embed
 from ..services.git_features import commit_features_json  # optionaler Git-Commit
-from ..db import fetch, fetchrow, execute  # DB-Helfer für Bans
+from ..db import fetch, fetchrow, execute, db_enabled  # DB-Helfer für Bans
+
+log = logging.getLogger("ignix.owner_tools")
+
+# orjson (optional) ist deutlich schneller und liefert direkt Bytes; sonst stdlib.
+# Lokal kompakt ohne Einrückung speichern (kleiner, schneller zu parsen) –
+# die lesbare Fassung landet ohnehin per commit_features_json im Repo.
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
 
 FEATURES_PATH = Path(__file__).resolve().parents[2] / "data" / "features.json"
 
 # --- Top.gg Links (für Vote-Reminder) ---
+# Obergrenze fürs Intervall (1 Jahr); hält interval_s sicher im INTEGER-Bereich
+VOTE_INTERVAL_MAX_H = 24 * 365
 TOPGG_BOT_URL = "https://top.gg/bot/1387561449592848454"
 TOPGG_VOTE_URL = "https://top.gg/bot/1387561449592848454/vote"
 
+# Guild-Namen-Map für /bot_guilds und /bot_bans wird kurz wiederverwendet
+_GNAME_TTL = 5.0
+
+# Standard-Einträge pro Seite für /bot_guilds und /bot_bans (per `limit` änderbar)
+LIST_PAGE_SIZE = 60
+
+# Embed-Beschreibung: Puffer unter Discords 4096-Zeichen-Limit, max. Zeilen je Embed
+_EMBED_DESC_LIMIT = 3900
+_EMBED_LINES_PER_PAGE = 60
+
+# Obergrenze einer /bot_guilds-Zeile: Guild-Name (max. 100) + ID (max. 20) + Markup
+_GUILD_LINE_MAX = 100 + 20 + len("• **** — ``\n")
+
+# SQL für public.bot_bans – feste Texte, damit asyncpgs Statement-Cache (pro
+# Pool-Verbindung) greift und Parse/Plan nur einmal pro Verbindung anfällt.
+# Upsert in EINEM Roundtrip: (xmax = 0) ist nur bei frisch eingefügten Zeilen wahr.
+_SQL_BAN_UPSERT = """
+INSERT INTO public.bot_bans (guild_id, reason) VALUES ($1, $2)
+ON CONFLICT (guild_id) DO UPDATE
+  SET reason = COALESCE(EXCLUDED.reason, public.bot_bans.reason)
+RETURNING (xmax = 0) AS inserted
+"""
+_SQL_BAN_DELETE = "DELETE FROM public.bot_bans WHERE guild_id=$1"
+_SQL_BAN_IDS = "SELECT guild_id FROM public.bot_bans"
+_SQL_BAN_COUNT = "SELECT COUNT(*) AS n FROM public.bot_bans"
+# ORDER BY added_at DESC + LIMIT nutzt bot_bans_added_at_desc_idx (siehe init_db)
+_SQL_BAN_PAGE = (
+    "SELECT guild_id, reason, added_at FROM public.bot_bans "
+    "ORDER BY added_at DESC LIMIT $1 OFFSET $2"
+)
+
+# In-Process-Cache: ((st_mtime_ns, st_size), Features, Namen in lowercase).
+# Solange sich die Datei nicht ändert, wird sie weder gelesen noch geparst;
+# das Namens-Set erlaubt eine O(1)-Duplikatprüfung.
+_FEATURES_CACHE: tuple[tuple[int, int], list[tuple[str, str]], set[str]] | None = None
+
+def _feature_names_lc() -> set[str]:
+    return _FEATURES_CACHE[2] if _FEATURES_CACHE is not None else set()
+
 def _load_features() -> list[tuple[str, str]]:
-    if FEATURES_PATH.exists():
-        try:
-            return [tuple(x) for x in json.loads(FEATURES_PATH.read_text(encoding="utf-8"))]
-        except Exception:
-            return []
-    return []
+    global _FEATURES_CACHE
+    try:
+        st = FEATURES_PATH.stat()
+    except OSError:
+        _FEATURES_CACHE = None
+        return []
+
+    key = (st.st_mtime_ns, st.st_size)
+    if _FEATURES_CACHE is not None and _FEATURES_CACHE[0] == key:
+        return list(_FEATURES_CACHE[1])  # Kopie – Aufrufer dürfen die Liste ändern
+
+    try:
+        features = [tuple(x) for x in _json_loads(FEATURES_PATH.read_bytes())]
+    except Exception:
+        features = []
+    _FEATURES_CACHE = (key, features, {n.lower() for n, _ in features})
+    return list(features)
 
 def _save_features(features: list[tuple[str, str]]) -> None:
-    FEATURES_PATH.write_text(json.dumps(features, ensure_ascii=False, indent=2), encoding="utf-8")
+    # Atomar schreiben: erst Temp-Datei, dann umbenennen. Ein abgebrochener
+    # Schreibvorgang hinterlässt so nie ein halbes JSON (→ leere Liste beim Laden).
+    global _FEATURES_CACHE
+    tmp = FEATURES_PATH.with_suffix(".json.tmp")
+    tmp.write_bytes(_json_dumps(features))
+    os.replace(tmp, FEATURES_PATH)
+    st = FEATURES_PATH.stat()
+
+    # Namens-Set fortschreiben statt neu aufbauen: die Liste wächst nur per Append
+    prev = _FEATURES_CACHE
+    if prev is not None and len(features) >= len(prev[1]):
+        names = prev[2]
+        names.update(n.lower() for n, _ in features[len(prev[1]):])
+    else:
+        names = {n.lower() for n, _ in features}
+    _FEATURES_CACHE = ((st.st_mtime_ns, st.st_size), list(features), names)
+
+# Datei-I/O nicht auf dem Event-Loop ausführen (blockiert sonst alle Guilds)
+async def _aload_features() -> list[tuple[str, str]]:
+    return await asyncio.to_thread(_load_features)
+
+async def _asave_features(features: list[tuple[str, str]]) -> None:
+    await asyncio.to_thread(_save_features, features)
+
+def _paginate(
+    lines: list[str],
+    max_chars: int = _EMBED_DESC_LIMIT,
+    max_lines: int = _EMBED_LINES_PER_PAGE,
+) -> list[str]:
+    """Teilt Zeilen in fertige Embed-Beschreibungen (max. max_chars Zeichen bzw. max_lines Zeilen)."""
+    # Kumulierte Längen (+1 für den Zeilenumbruch); Seitengrenzen nur als Indizes
+    # per Binärsuche bestimmen, danach je Seite ein einziges join
+    lens = list(itertools.accumulate(len(line) + 1 for line in lines))
+    bounds: list[tuple[int, int]] = []
+    L, N, n_lines = max_chars, max_lines, len(lines)
+    start = 0
+    while start < n_lines:
+        base = lens[start - 1] if start else 0
+        cut = min(bisect.bisect_right(lens, base + L, lo=start), start + N)
+        cut = max(cut, start + 1)  # überlange Einzelzeile trotzdem ausgeben
+        bounds.append((start, cut))
+        start = cut
+    return ["\n".join(lines[s:e]) for s, e in bounds]
+
+async def _send_pages(interaction: discord.Interaction, title: str, pages: list[str], color: discord.Color) -> None:
+    """Erste Seite direkt, restliche Seiten parallel als Follow-ups (Rate-Limits regelt discord.py)."""
+    embeds = [discord.Embed(title=title, description=text, color=color) for text in pages]
+    # Teilnummer im Footer (Titel bleibt gleich), da parallele Follow-ups
+    # nicht in Reihenfolge ankommen müssen
+    if len(embeds) > 1:
+        n = len(embeds)
+        for i, emb in enumerate(embeds, 1):
+            emb.set_footer(text=f"Teil {i}/{n}")
+    await send_embed(interaction, embeds[0], ephemeral=True)
+    results = await asyncio.gather(
+        *(send_embed(interaction, e, ephemeral=True) for e in embeds[1:]),
+        return_exceptions=True,
+    )
+    for exc in results:
+        if isinstance(exc, BaseException):
+            log.warning("follow-up page failed: %r", exc)
 
+def _parse_gid(s: str) -> int | None:
+    """Guild-ID (Snowflake, 17–20 Ziffern) → int; None bei ungültiger Eingabe, ohne Exception-Pfad."""
+    s = s.strip()
+    return int(s) if 17 <= len(s) <= 20 and s.isascii() and s.isdigit() else None
 
 # ---------- Einfacher Link-Button für Top.gg ----------
 class VoteSimpleView(discord.ui.View):
@@ -41,39 +181,108 @@ class VoteSimpleView(discord.ui.View):
             url=TOPGG_VOTE_URL
         ))
 
-def make_vote_embed(guild_name: str | None = None) -> discord.Embed:
-    """Auffälliges rotes Embed für mehr Sichtbarkeit."""
-    title = "🚨 Bitte unterstützt Ignix auf Top.gg!"
-    desc = (
+# Zustandslos (nur Link-Button, kein Timeout) → eine Instanz für alle Reminder.
+# View() braucht einen laufenden Event-Loop, daher erst bei Bedarf erzeugen.
+_VOTE_VIEW: VoteSimpleView | None = None
+_VOTE_ALLOWED = discord.AllowedMentions(everyone=True, roles=False, users=False)
+
+def _vote_view() -> VoteSimpleView:
+    global _VOTE_VIEW
+    if _VOTE_VIEW is None:
+        _VOTE_VIEW = VoteSimpleView()
+    return _VOTE_VIEW
+
+# Titel/Beschreibung/Farbe sind konstant – nur der Footer hängt von der Guild ab
+_BASE_VOTE_EMBED = discord.Embed(
+    title="🚨 Bitte unterstützt Ignix auf Top.gg!",
+    description=(
         "**Euer Vote hilft enorm**, damit der Bot sichtbarer wird und wir weiter ausbauen können.\n\n"
         "➡️ **Klickt auf den Button unten** und stimmt für uns ab.\n"
         f"ℹ️ Alternativ: {TOPGG_BOT_URL}\n\n"
         "🙏 Vielen Dank für eure Unterstützung!"
-    )
-    emb = discord.Embed(title=title, description=desc, color=discord.Color.red())
+    ),
+    color=discord.Color.red(),
+)
+
+def make_vote_embed(guild_name: str | None = None) -> discord.Embed:
+    """Auffälliges rotes Embed für mehr Sichtbarkeit."""
+    emb = _BASE_VOTE_EMBED.copy()
     if guild_name:
         emb.set_footer(text=f"Ignix • {guild_name}")
     else:
         emb.set_footer(text="Ignix • Vote-Reminder")
     return emb
 
+# Übersetztes Vote-Embed pro (guild_id, guild_name) → kein translate_embed bei jedem Reminder
+_VOTE_EMBED_TTL = 6 * 3600
+_vote_embed_cache: dict[tuple[int, str], tuple[float, discord.Embed]] = {}
+
+async def _translated_vote_embed(guild: discord.Guild) -> discord.Embed:
+    key = (guild.id, guild.name)
+    now = time.monotonic()
+    hit = _vote_embed_cache.get(key)
+    if hit and now - hit[0] < _VOTE_EMBED_TTL:
+        return hit[1].copy()
+
+    emb = await translate_embed(guild.id, make_vote_embed(guild.name))
+    # Abgelaufene Einträge opportunistisch entfernen
+    for k in [k for k, (ts, _) in _vote_embed_cache.items() if now - ts >= _VOTE_EMBED_TTL]:
+        del _vote_embed_cache[k]
+    _vote_embed_cache[key] = (now, emb)
+    return emb.copy()
+
 
 class OwnerToolsCog(commands.Cog):
     """Owner-only Werkzeuge (Serverliste, Feature-Pflege, Bot verlassen lassen, permanente Bot-Bans, Vote-Reminder)."""
 
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        # Laufende, einfache (nicht persistente) Reminder-Tasks: channel_id -> Task
-        self._vote_tasks: dict[int, asyncio.Task] = {}
+        # Gebannte Guild-IDs im Speicher (None = nicht geladen → Aufrufer fragen die DB)
+        self._banned_ids: set[int] | None = None
+        # (monotonic-Zeitstempel, {guild_id: name}) – siehe _gnames()
+        self._gname_cache: tuple[float, dict[int, str]] | None = None
+        # Ein Scheduler für alle Vote-Reminder (persistiert in public.vote_reminders).
+        # Ohne DB (DATABASE_URL optional) gibt es nichts zu scannen → Loop gar nicht erst starten.
+        if db_enabled():
+            self.scan_vote_reminders.start()
+
+    async def cog_load(self):
+        try:
+            rows = await fetch(_SQL_BAN_IDS)
+        except Exception as e:
+            log.warning("loading bot_bans failed: %r", e)
+            return
+        self._banned_ids = {int(r["guild_id"]) for r in rows}
 
-    # Beim Unload alle Reminder stoppen
     def cog_unload(self):
-        for t in list(self._vote_tasks.values()):
-            try:
-                t.cancel()
-            except Exception:
-                pass
-        self._vote_tasks.clear()
+        try:
+            self.scan_vote_reminders.cancel()
+        except Exception:
+            pass
+
+    def is_banned(self, guild_id: int) -> bool | None:
+        """O(1)-Ban-Check für on_guild_join; None, falls der Cache nicht geladen ist."""
+        if self._banned_ids is None:
+            return None
+        return guild_id in self._banned_ids
+
+    def _gnames(self) -> dict[int, str]:
+        """{guild_id: name} aller Guilds; bis zu _GNAME_TTL Sekunden aus dem Cache."""
+        now = time.monotonic()
+        hit = self._gname_cache
+        if hit is not None and now - hit[0] < _GNAME_TTL:
+            return hit[1]
+        names = {g.id: g.name for g in self.bot.guilds}
+        self._gname_cache = (now, names)
+        return names
+
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild: discord.Guild):
+        self._gname_cache = None
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        self._gname_cache = None
 
     async def _ensure_owner(self, interaction: discord.Interaction) -> bool:
         if interaction.user.id != settings.owner_id:
@@ -88,49 +297,58 @@ class OwnerToolsCog(commands.Cog):
 
     # ───────────────────────── /bot_guilds ─────────────────────────
     @app_commands.command(name="bot_guilds", description="(Owner) Liste aller Server: Name + ID.")
-    @app_commands.describe(query="Optional: Filter (Teil vom Servernamen)")
-    async def list_bot_guilds(self, interaction: discord.Interaction, query: str | None = None):
+    @app_commands.describe(
+        query="Optional: Filter (Teil vom Servernamen)",
+        page="Seite (Standard: 1)",
+        limit="Server pro Seite (1–500, Standard: 60)",
+    )
+    async def list_bot_guilds(
+        self,
+        interaction: discord.Interaction,
+        query: str | None = None,
+        page: int = 1,
+        limit: app_commands.Range[int, 1, 500] = LIST_PAGE_SIZE,
+    ):
         if not await self._ensure_owner(interaction):
             return
 
-        guilds = list(self.bot.guilds)
+        # Namen nur einmal pro Guild normalisieren (für Filter UND Sortierung);
+        # casefold statt lower, damit z. B. "ß" und "SS" zusammenpassen
+        pairs = [((name or "").casefold(), gid, name) for gid, name in self._gnames().items()]
         if query:
-            q = query.lower()
-            guilds = [g for g in guilds if (g.name or "").lower().find(q) != -1]
+            q = query.casefold()
+            pairs = [p for p in pairs if q in p[0]]
+
+        pairs.sort(key=operator.itemgetter(0))
+        guilds = [(gid, name) for _, gid, name in pairs]
 
-        guilds.sort(key=lambda g: (g.name or "").lower())
-        lines = [f"• **{g.name}** — `{g.id}`" for g in guilds]
+        # Nur die angefragte Seite formatieren
+        total = len(guilds)
+        n_pages = max(1, -(-total // limit))
+        page = min(max(1, page), n_pages)
+        start = (page - 1) * limit
+        page_guilds = guilds[start:start + limit]
 
         if not interaction.response.is_done():
             await interaction.response.defer(ephemeral=True)
 
-        # In Embeds paginieren
-        pages: list[list[str]] = []
-        cur: list[str] = []
-        cur_len = 0
-        for line in lines:
-            if cur_len + len(line) + 1 > 3900 or len(cur) >= 60:
-                pages.append(cur)
-                cur, cur_len = [], 0
-            cur.append(line)
-            cur_len += len(line) + 1
-        if cur:
-            pages.append(cur)
-
-        if not pages:
+        if not page_guilds:
             return await reply_text(interaction, "ℹ️ Der Bot ist aktuell in **keinem** Server.", ephemeral=True)
 
-        title = f"🤖 Bot-Server ({len(guilds)})"
-        emb = discord.Embed(title=title, description="\n".join(pages[0]), color=discord.Color.blurple())
-        await send_embed(interaction, emb, ephemeral=True)
+        title = f"🤖 Bot-Server ({total})"
+        if n_pages > 1:
+            title += f" – Seite {page}/{n_pages}"
 
-        for i in range(1, len(pages)):
-            emb = discord.Embed(
-                title=title + f" – Seite {i+1}",
-                description="\n".join(pages[i]),
-                color=discord.Color.blurple(),
-            )
-            await send_embed(interaction, emb, ephemeral=True)
+        # Passt garantiert in ein Embed → direkt joinen, ohne Zeilenliste/Aufteilung
+        if len(page_guilds) * _GUILD_LINE_MAX <= _EMBED_DESC_LIMIT:
+            desc = "\n".join(f"• **{name}** — `{gid}`" for gid, name in page_guilds)
+            emb = discord.Embed(title=title, description=desc, color=discord.Color.blurple())
+            return await send_embed(interaction, emb, ephemeral=True)
+
+        # In Embeds paginieren
+        lines = [f"• **{name}** — `{gid}`" for gid, name in page_guilds]
+        pages = _paginate(lines)
+        await _send_pages(interaction, title, pages, discord.Color.blurple())
 
     # ───────────────────────── /add_feature ────────────────────────
     @app_commands.command(name="add_feature", description="(Owner) Feature zur Liste hinzufügen")
@@ -139,8 +357,8 @@ class OwnerToolsCog(commands.Cog):
         if not await self._ensure_owner(interaction):
             return
 
-        features = _load_features()
-        if any(n.lower() == name.lower() for n, _ in features):
+        features = await _aload_features()
+        if name.lower() in _feature_names_lc():
             return await reply_text(
                 interaction,
                 f"⚠️ Feature `{name}` existiert bereits.",
@@ -148,7 +366,7 @@ class OwnerToolsCog(commands.Cog):
             )
 
         features.append((name, description))
-        _save_features(features)
+        await _asave_features(features)
 
         ok = await commit_features_json(features)  # best-effort
         note = " (Git commit ✓)" if ok else ""
@@ -175,12 +393,11 @@ class OwnerToolsCog(commands.Cog):
         if not interaction.response.is_done():
             await interaction.response.defer(ephemeral=True)
 
-        try:
-            gid = int(guild_id)
-        except ValueError:
+        gid = _parse_gid(guild_id)
+        if gid is None:
             return await reply_text(
                 interaction,
-                "❌ Ungültige Guild-ID (keine Zahl).",
+                "❌ Ungültige Guild-ID (17–20 Ziffern erwartet).",
                 kind="error",
                 ephemeral=True,
             )
@@ -226,29 +443,28 @@ class OwnerToolsCog(commands.Cog):
         if not interaction.response.is_done():
             await interaction.response.defer(ephemeral=True)
 
-        try:
-            gid = int(guild_id)
-        except ValueError:
-            return await reply_text(interaction, "❌ Ungültige Guild-ID (keine Zahl).", kind="error", ephemeral=True)
-
-        existing = await fetchrow("SELECT guild_id FROM public.bot_bans WHERE guild_id=$1", gid)
-        if existing:
-            if reason:
-                await execute("UPDATE public.bot_bans SET reason=$2 WHERE guild_id=$1", gid, reason)
-                return await reply_text(interaction, f"✅ Guild `{gid}` war bereits gebannt – Grund aktualisiert.", kind="success", ephemeral=True)
-            return await reply_text(interaction, f"ℹ️ Guild `{gid}` ist bereits gebannt.", ephemeral=True)
-
-        await execute(
-            "INSERT INTO public.bot_bans (guild_id, reason) VALUES ($1, $2)",
-            gid, (reason or None)
-        )
+        gid = _parse_gid(guild_id)
+        if gid is None:
+            return await reply_text(interaction, "❌ Ungültige Guild-ID (17–20 Ziffern erwartet).", kind="error", ephemeral=True)
 
+        # Erst den Ban speichern, dann verlassen – bewusst NICHT parallel (asyncio.gather):
+        # schlägt der DB-Write fehl (→ globaler Error-Handler), bleibt der Bot in der Guild,
+        # statt ungebannt zu gehen und wieder eingeladen werden zu können.
+        row = await fetchrow(_SQL_BAN_UPSERT, gid, (reason or None))
         g = self.bot.get_guild(gid)
         if g:
             try:
                 await g.leave()
-            except Exception:
-                pass
+            except Exception as e:
+                log.warning("bot_ban: leaving guild %s failed: %r", gid, e)
+
+        if self._banned_ids is not None:
+            self._banned_ids.add(gid)
+
+        if not row["inserted"]:
+            if reason:
+                return await reply_text(interaction, f"✅ Guild `{gid}` war bereits gebannt – Grund aktualisiert.", kind="success", ephemeral=True)
+            return await reply_text(interaction, f"ℹ️ Guild `{gid}` ist bereits gebannt.", ephemeral=True)
 
         return await reply_text(
             interaction,
@@ -266,64 +482,63 @@ class OwnerToolsCog(commands.Cog):
         if not interaction.response.is_done():
             await interaction.response.defer(ephemeral=True)
 
-        try:
-            gid = int(guild_id)
-        except ValueError:
-            return await reply_text(interaction, "❌ Ungültige Guild-ID (keine Zahl).", kind="error", ephemeral=True)
+        gid = _parse_gid(guild_id)
+        if gid is None:
+            return await reply_text(interaction, "❌ Ungültige Guild-ID (17–20 Ziffern erwartet).", kind="error", ephemeral=True)
 
-        await execute("DELETE FROM public.bot_bans WHERE guild_id=$1", gid)
+        await execute(_SQL_BAN_DELETE, gid)
+        if self._banned_ids is not None:
+            self._banned_ids.discard(gid)
         return await reply_text(interaction, f"✅ Guild `{gid}` ist nicht länger gebannt.", kind="success", ephemeral=True)
 
     @app_commands.command(name="bot_bans", description="(Owner) Zeigt die Liste permanent gebannter Guilds.")
-    async def list_bans(self, interaction: discord.Interaction):
+    @app_commands.describe(
+        page="Seite (Standard: 1)",
+        limit="Einträge pro Seite (1–500, Standard: 60)",
+    )
+    async def list_bans(
+        self,
+        interaction: discord.Interaction,
+        page: int = 1,
+        limit: app_commands.Range[int, 1, 500] = LIST_PAGE_SIZE,
+    ):
         if not await self._ensure_owner(interaction):
             return
 
         if not interaction.response.is_done():
             await interaction.response.defer(ephemeral=True)
 
-        rows = await fetch(
-            "SELECT guild_id, reason, added_at FROM public.bot_bans ORDER BY added_at DESC LIMIT 200"
-        )
+        count_row = await fetchrow(_SQL_BAN_COUNT)
+        total = int(count_row["n"]) if count_row else 0
+        if not total:
+            return await reply_text(interaction, "ℹ️ Es sind aktuell **keine** Guilds gebannt.", ephemeral=True)
+
+        # Paginierung in Postgres: nur so viele Zeilen wie angefragt laden
+        n_pages = max(1, -(-total // limit))
+        page = min(max(1, page), n_pages)
+        rows = await fetch(_SQL_BAN_PAGE, limit, (page - 1) * limit)
         if not rows:
             return await reply_text(interaction, "ℹ️ Es sind aktuell **keine** Guilds gebannt.", ephemeral=True)
 
-        lines: list[str] = []
-        for r in rows:
-            gid = r.get("guild_id")
-            reason = r.get("reason") or "—"
-            added = r.get("added_at")
-            g = self.bot.get_guild(int(gid)) if gid is not None else None
-            name = g.name if g else "?"
-            if added:
-                lines.append(f"• **{name}** — `{gid}` • Grund: {reason} • seit: {added}")
-            else:
-                lines.append(f"• **{name}** — `{gid}` • Grund: {reason}")
-
-        pages: list[list[str]] = []
-        cur: list[str] = []
-        cur_len = 0
-        for line in lines:
-            if cur_len + len(line) + 1 > 3900 or len(cur) >= 60:
-                pages.append(cur)
-                cur, cur_len = [], 0
-            cur.append(line)
-            cur_len += len(line) + 1
-        if cur:
-            pages.append(cur)
-
-        title = f"🚫 Gebannte Guilds ({len(rows)})"
-        emb = discord.Embed(title=title, description="\n".join(pages[0]), color=discord.Color.red())
-        await send_embed(interaction, emb, ephemeral=True)
-        for i in range(1, len(pages)):
-            emb = discord.Embed(
-                title=title + f" – Seite {i+1}",
-                description="\n".join(pages[i]),
-                color=discord.Color.red(),
+        # Records positionsweise entpacken (guild_id ist bereits int), Vorlagen einmal wählen
+        tmpl = "• **{n}** — `{g}` • Grund: {r} • seit: {a}"
+        tmpl_no_date = "• **{n}** — `{g}` • Grund: {r}"
+        guild_names = self._gnames()
+        lines = [
+            (tmpl if added else tmpl_no_date).format(
+                n=guild_names.get(gid, "?"), g=gid, r=reason or "—", a=added,
             )
-            await send_embed(interaction, emb, ephemeral=True)
+            for gid, reason, added in rows
+        ]
 
-    # ───────────────────── Vote-Reminder (OHNE DB, wiederkehrend) ─────────────────────
+        pages = _paginate(lines)
+
+        title = f"🚫 Gebannte Guilds ({total})"
+        if n_pages > 1:
+            title += f" – Seite {page}/{n_pages}"
+        await _send_pages(interaction, title, pages, discord.Color.red())
+
+    # ───────────────────── Vote-Reminder (persistent, wiederkehrend) ─────────────────────
 
     @app_commands.command(
         name="vote_broadcast_start",
@@ -331,55 +546,32 @@ class OwnerToolsCog(commands.Cog):
     )
     @app_commands.describe(
         channel="Kanal, in dem erinnert werden soll",
-        interval_hours="Intervall in Stunden (Standard: 24)"
+        interval_hours="Intervall in Stunden (1–8760, Standard: 24)"
     )
     async def vote_broadcast_start(
         self,
         interaction: discord.Interaction,
         channel: discord.TextChannel,
-        interval_hours: int = 24
+        interval_hours: app_commands.Range[int, 1, VOTE_INTERVAL_MAX_H] = 24
     ):
         if not await self._ensure_owner(interaction):
             return
 
-        if interval_hours <= 0:
-            return await reply_text(interaction, "❌ Ungültiges Intervall.", kind="error", ephemeral=True)
-
-        # Falls schon ein Task für diesen Kanal läuft: erst stoppen
-        old = self._vote_tasks.pop(channel.id, None)
-        if old:
-            try:
-                old.cancel()
-            except Exception:
-                pass
-
-        view = VoteSimpleView()
-        allowed = discord.AllowedMentions(everyone=True, roles=False, users=False)
         interval_seconds = int(interval_hours * 3600)
 
-        async def _loop():
-            while True:
-                try:
-                    emb = make_vote_embed(channel.guild.name)
-                    emb = await translate_embed(channel.guild.id, emb)
-                    # NEU: tracked_send für Usage-Logging (mixed: content + embed)
-                    await tracked_send(
-                        channel,
-                        content="@everyone",
-                        embed=emb,
-                        view=view,
-                        guild_id=channel.guild.id,
-                        allowed_mentions=allowed,
-                    )
-                except discord.Forbidden:
-                    break  # Keine Rechte mehr → Task beenden
-                except Exception:
-                    # Unerwarteter Fehler: trotzdem weitermachen
-                    pass
-                await asyncio.sleep(interval_seconds)
-
-        task = asyncio.create_task(_loop())
-        self._vote_tasks[channel.id] = task
+        # Upsert: ein bestehender Reminder für diesen Kanal wird ersetzt.
+        # next_fire_at = now() → der Scheduler postet beim nächsten Durchlauf.
+        await execute(
+            """
+            INSERT INTO public.vote_reminders (channel_id, guild_id, interval_s, next_fire_at)
+            VALUES ($1, $2, $3, now())
+            ON CONFLICT (channel_id) DO UPDATE
+              SET guild_id     = EXCLUDED.guild_id,
+                  interval_s   = EXCLUDED.interval_s,
+                  next_fire_at = EXCLUDED.next_fire_at
+            """,
+            channel.id, channel.guild.id, interval_seconds,
+        )
 
         return await reply_text(
             interaction,
@@ -397,12 +589,11 @@ class OwnerToolsCog(commands.Cog):
         if not await self._ensure_owner(interaction):
             return
 
-        task = self._vote_tasks.pop(channel.id, None)
-        if task:
-            try:
-                task.cancel()
-            except Exception:
-                pass
+        deleted = await fetchrow(
+            "DELETE FROM public.vote_reminders WHERE channel_id=$1 RETURNING channel_id",
+            channel.id,
+        )
+        if deleted:
             return await reply_text(
                 interaction,
                 f"🛑 Vote-Reminder in {channel.mention} gestoppt.",
@@ -416,6 +607,122 @@ class OwnerToolsCog(commands.Cog):
                 ephemeral=True,
             )
 
+    @app_commands.command(
+        name="vote_broadcast_list",
+        description="(Owner) Zeigt alle aktiven Vote-Reminder."
+    )
+    async def vote_broadcast_list(self, interaction: discord.Interaction):
+        if not await self._ensure_owner(interaction):
+            return
+
+        if not interaction.response.is_done():
+            await interaction.response.defer(ephemeral=True)
+
+        rows = await fetch(
+            "SELECT channel_id, guild_id, interval_s, next_fire_at FROM public.vote_reminders ORDER BY next_fire_at"
+        )
+        if not rows:
+            return await reply_text(interaction, "ℹ️ Es läuft derzeit **kein** Vote-Reminder.", ephemeral=True)
+
+        lines = [
+            f"• <#{cid}> — Guild `{gid}` • alle **{interval_s // 3600}h** • nächster: <t:{int(next_at.timestamp())}:R>"
+            for cid, gid, interval_s, next_at in rows
+        ]
+        pages = _paginate(lines)
+        title = f"📣 Vote-Reminder ({len(rows)})"
+        await _send_pages(interaction, title, pages, discord.Color.red())
+
+    # ---------------------------- Scheduler-Loop ----------------------------
+
+    @tasks.loop(seconds=30)
+    async def scan_vote_reminders(self):
+        """
+        Sendet fällige Vote-Reminder (next_fire_at <= now) und plant den
+        nächsten Termin. Ein Loop für alle Kanäle statt eines Tasks pro Kanal.
+        Fehler werden pro Reminder geloggt – ein Ausreißer darf den Loop
+        (und damit alle übrigen Reminder) nicht beenden.
+        """
+        try:
+            rows = await fetch(
+                "SELECT channel_id FROM public.vote_reminders WHERE next_fire_at <= now()"
+            )
+        except Exception:
+            log.exception("vote reminder scan failed")
+            return
+
+        for r in rows:
+            cid = int(r["channel_id"])
+            try:
+                await self._fire_vote_reminder(cid)
+            except asyncio.CancelledError:
+                # cog_unload → Loop sauber beenden
+                raise
+            except Exception:
+                log.exception("vote reminder for channel %s failed", cid)
+
+    async def _resolve_reminder_channel(self, cid: int) -> discord.TextChannel | None:
+        """
+        Kanal aus dem Cache bzw. per API. Gelöscht/kein Zugriff (NotFound/Forbidden)
+        → Reminder entfernen; sonst (Guild kurz unavailable, Cache noch nicht bereit,
+        HTTP-Fehler) None → im nächsten Durchlauf erneut versuchen.
+        """
+        channel = self.bot.get_channel(cid)
+        if channel is None:
+            try:
+                channel = await self.bot.fetch_channel(cid)
+            except (discord.NotFound, discord.Forbidden):
+                await execute("DELETE FROM public.vote_reminders WHERE channel_id=$1", cid)
+                return None
+            except discord.HTTPException:
+                return None
+        if not isinstance(channel, discord.TextChannel) or channel.guild.unavailable:
+            return None
+        return channel
+
+    async def _fire_vote_reminder(self, cid: int) -> None:
+        channel = await self._resolve_reminder_channel(cid)
+        if channel is None:
+            return
+
+        try:
+            emb = await _translated_vote_embed(channel.guild)
+            # tracked_send für Usage-Logging (mixed: content + embed)
+            await tracked_send(
+                channel,
+                content="@everyone",
+                embed=emb,
+                view=_vote_view(),
+                guild_id=channel.guild.id,
+                allowed_mentions=_VOTE_ALLOWED,
+            )
+        except (discord.NotFound, discord.Forbidden):
+            # Kanal weg bzw. keine Rechte mehr → Reminder beenden
+            await execute("DELETE FROM public.vote_reminders WHERE channel_id=$1", cid)
+            return
+        except discord.HTTPException as e:
+            # Unerwarteter Sendefehler: loggen und trotzdem weiter planen
+            log.warning("vote reminder send to %s failed: %r", cid, e)
+
+        # Vom geplanten Termin aus weiterzählen (nicht ab now()), damit Sendedauer
+        # und Scan-Raster den Takt nicht verschieben. Lag der Bot länger offline,
+        # ab jetzt neu planen statt verpasste Termine nachzuholen.
+        await execute(
+            """
+            UPDATE public.vote_reminders
+            SET next_fire_at = CASE
+                  WHEN next_fire_at + interval_s * interval '1 second' > now()
+                    THEN next_fire_at + interval_s * interval '1 second'
+                  ELSE now() + interval_s * interval '1 second'
+                END
+            WHERE channel_id=$1
+            """,
+            cid,
+        )
+
+    @scan_vote_reminders.before_loop
+    async def _before_vote_scan(self):
+        await self.bot.wait_until_ready()
+
 
 async def setup(bot: commands.Bot):
     await bot.add_cog(OwnerToolsCog(bot))
\ No newline at end of file
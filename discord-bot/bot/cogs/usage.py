@@ -1,15 +1,17 @@
 # bot/cogs/usage.py
 from __future__ import annotations
-from typing import Optional, Iterable, Literal, Sequence
+from typing import Optional, Iterable, Literal
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 import logging
 
 import discord
 from discord import app_commands
-from discord.ext import commands
+from discord.ext import commands, tasks
 
-from ..db import execute, fetch
-from ..services.guild_config import get_guild_cfg
+from ..db import execute, fetch, fetchrow, db_enabled
+from ..services.guild_config import get_guild_lang, cached_guild_lang, warm_guild_langs
+from ..services.usage_log import log_usage, insert_usage, start_usage_flusher, stop_usage_flusher, flush_usage
 from ..config import settings
 from ..utils.replies import make_embed, send_embed, reply_text, tracked_send
 
@@ -17,38 +19,30 @@ log = logging.getLogger("ignix.usage")
 
 # ───────────────────────────── Helpers: Counting ─────────────────────────────
 
-def _safe_len(s: Optional[str]) -> int:
-    return len(s or "")
-
 def count_embed_chars(embed: discord.Embed) -> int:
-    n = 0
-    n += _safe_len(embed.title)
-    n += _safe_len(embed.description)
-    if embed.footer and getattr(embed.footer, "text", None):
-        n += _safe_len(embed.footer.text)
-    if embed.author and getattr(embed.author, "name", None):
-        n += _safe_len(embed.author.name)
-    for f in (embed.fields or []):
-        n += _safe_len(f.name)
-        n += _safe_len(f.value)
-    return n
+    # Embed.__len__ zählt genau Titel, Beschreibung, Felder (Name+Wert),
+    # Footer-Text und Autor-Namen – direkt über die Roh-Dicts, ohne EmbedProxy
+    return len(embed)
 
 def total_message_chars(content: Optional[str], embeds: Iterable[discord.Embed] | None) -> int:
-    total = _safe_len(content)
+    total = len(content) if content else 0
     if embeds:
-        for e in embeds:
-            total += count_embed_chars(e)
+        total += sum(map(len, embeds))  # len(embed) == count_embed_chars(embed)
     return total
 
+_LANGS = frozenset({"de", "en", "dm"})
+
 async def _guild_lang(guild_id: Optional[int]) -> str:
     if not guild_id:
         return "dm"
-    try:
-        cfg = await get_guild_cfg(guild_id)
-        lang = str(cfg.get("lang") or "de").lower()
-        return lang if lang in {"de", "en", "dm"} else "de"
-    except Exception:
-        return "de"
+    # Vorgewärmter Cache (cog_load) → reiner Dict-Lookup, DB nur bei Miss
+    lang = cached_guild_lang(guild_id)
+    if lang is None:
+        try:
+            lang = await get_guild_lang(guild_id)
+        except Exception:
+            return "de"
+    return lang if lang in _LANGS else "de"
 
 
 # ───────────────────── Export für replies.py (ephemeral logging) ────────────
@@ -60,10 +54,12 @@ async def log_interaction_output(
     embeds: Optional[list[discord.Embed]] = None,
     message_type: str = "ephemeral",
 ) -> None:
+    if not content and embed is None and not embeds:
+        return  # nichts Sichtbares → weder zählen noch Sprache nachschlagen
     try:
         if embeds is None and embed is not None:
             embeds = [embed]
-        chars = total_message_chars(content, embeds or [])
+        chars = total_message_chars(content, embeds)
         if chars <= 0:
             return
 
@@ -72,15 +68,9 @@ async def log_interaction_output(
         user_id = inter.user.id if inter.user else None
         lang = await _guild_lang(guild_id)
 
-        await execute(
-            """
-            INSERT INTO public.output_usage
-                (ts, guild_id, channel_id, user_id, message_type, chars, lang, is_dm, is_ephemeral)
-            VALUES (now(), $1, $2, $3, $4, $5, $6, $7, $8)
-            """,
-            guild_id, channel_id, user_id, message_type, int(chars), lang, False, True,
-        )
-        log.debug("[EPH] +%s chars (gid=%s cid=%s uid=%s)", chars, guild_id, channel_id, user_id)
+        await log_usage(guild_id, channel_id, user_id, message_type, chars, lang, False, True)
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("[EPH] +%s chars (gid=%s cid=%s uid=%s)", chars, guild_id, channel_id, user_id)
     except Exception as e:
         log.exception("ephemeral log failed: %r", e)
 
@@ -91,8 +81,24 @@ RangeOpt = Literal["today", "yesterday", "7d", "30d", "custom"]
 BreakdownOpt = Literal["total", "by_guild", "by_channel", "by_lang", "by_type"]
 LangOpt = Literal["any", "de", "en", "dm"]
 
-def _owner_only(user: discord.abc.User) -> bool:
-    return int(user.id) == int(settings.owner_id)
+_TD_1D = timedelta(days=1)
+_TD_7D = timedelta(days=7)
+_TD_30D = timedelta(days=30)
+_TD_1H = timedelta(hours=1)
+
+@lru_cache(maxsize=256)
+def _parse_iso(s: str) -> datetime:
+    """ISO 8601 → tz-aware datetime (naiv = UTC); wiederholte custom-Abfragen parsen nicht neu."""
+    dt = datetime.fromisoformat(s)
+    return dt if dt.tzinfo is not None else dt.replace(tzinfo=timezone.utc)
+
+# Feste Zeiträume: (now, Tagesbeginn) -> (start, end, label); "custom" wird geparst
+_FIXED_WINDOWS = {
+    "today":     lambda now, sod: (sod, now, "Heute"),
+    "yesterday": lambda now, sod: (sod - _TD_1D, sod, "Gestern"),
+    "7d":        lambda now, sod: (now - _TD_7D, now, "Letzte 7 Tage"),
+    "30d":       lambda now, sod: (now - _TD_30D, now, "Letzte 30 Tage"),
+}
 
 def _time_window(
     range_opt: RangeOpt,
@@ -100,35 +106,93 @@ def _time_window(
     to_iso: Optional[str],
     now: Optional[datetime] = None,
 ) -> tuple[datetime, datetime, str]:
-    now = now or datetime.now(timezone.utc)
-    if range_opt == "today":
-        start = now.astimezone(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
-        return start, now, "Heute"
-    if range_opt == "yesterday":
-        midnight = now.astimezone(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
-        start = midnight - timedelta(days=1)
-        return start, midnight, "Gestern"
-    if range_opt == "7d":
-        return now - timedelta(days=7), now, "Letzte 7 Tage"
-    if range_opt == "30d":
-        return now - timedelta(days=30), now, "Letzte 30 Tage"
-
-    try:
-        start = datetime.fromisoformat((from_iso or "").strip())
-    except Exception:
-        start = now - timedelta(days=1)
-    try:
-        end = datetime.fromisoformat((to_iso or "").strip())
-    except Exception:
-        end = now
-    if start.tzinfo is None:
-        start = start.replace(tzinfo=timezone.utc)
-    if end.tzinfo is None:
-        end = end.replace(tzinfo=timezone.utc)
+    now = now or datetime.now(timezone.utc)  # `now` ist immer UTC
+    fixed = _FIXED_WINDOWS.get(range_opt)
+    if fixed is not None:
+        return fixed(now, now.replace(hour=0, minute=0, second=0, microsecond=0))
+
+    # Leere Angaben → Standard (letzte 24h bis jetzt); ungültige → ValueError
+    from_iso = (from_iso or "").strip()
+    to_iso = (to_iso or "").strip()
+    start = _parse_iso(from_iso) if from_iso else now - _TD_1D
+    end = _parse_iso(to_iso) if to_iso else now
     return start, end, "Benutzerdefiniert"
 
-def _flag_array(include: bool) -> Sequence[bool]:
-    return [True, False] if include else [False]
+# (include_dm, include_ephemeral) -> feste WHERE-Bedingung. "mitrechnen" heißt
+# "kein Filter"; sonst reiner Vergleich statt `= ANY($n::boolean[])`, den der
+# Planer nicht als Gleichheit für den Index nutzen kann.
+_FLAG_WHERE: dict[tuple[bool, bool], str] = {
+    (True,  True):  "",
+    (True,  False): " AND is_ephemeral = false",
+    (False, True):  " AND is_dm = false",
+    (False, False): " AND is_dm = false AND is_ephemeral = false",
+}
+
+def _hourly_span(start: datetime, end: datetime, upto: Optional[datetime]) -> tuple[datetime, datetime] | None:
+    """
+    Volle Stunden [h0, h1) innerhalb von start..end, die output_usage_hourly
+    bereits vollständig enthält (upto = max(hour) + 1h nach dem letzten Rollup); sonst None.
+    """
+    if upto is None:
+        return None
+    start = start.astimezone(timezone.utc)  # custom-Zeitfenster können andere Offsets haben
+    end = end.astimezone(timezone.utc)
+    h0 = start.replace(minute=0, second=0, microsecond=0)
+    if h0 < start:
+        h0 += _TD_1H
+    h1 = min(end.replace(minute=0, second=0, microsecond=0), upto)
+    if h1 - h0 < _TD_1H:
+        return None
+    return h0, h1
+
+# Stunden-Rollup: aggregiert [max(hour) - 1h, cutoff) neu – die letzte fertige Stunde
+# wird jedes Mal erneut gerechnet und fängt so verspätet geschriebene Zeilen ab.
+# Ersetzt (nicht addiert) die Summen → beliebig oft wiederholbar. Stunden in UTC.
+_ROLLUP_LAG = timedelta(minutes=5)
+_SQL_ROLLUP = """
+INSERT INTO public.output_usage_hourly
+    (hour, guild_id, channel_id, lang, message_type, is_dm, is_ephemeral, sum_chars)
+SELECT date_trunc('hour', ts AT TIME ZONE 'UTC') AT TIME ZONE 'UTC',
+       COALESCE(guild_id, 0), COALESCE(channel_id, 0), COALESCE(lang, ''), message_type,
+       COALESCE(is_dm, false), COALESCE(is_ephemeral, false), SUM(chars)
+FROM public.output_usage
+WHERE ts < $1
+  AND ts >= COALESCE(
+        (SELECT max(hour) - interval '1 hour' FROM public.output_usage_hourly), '-infinity')
+GROUP BY 1, 2, 3, 4, 5, 6, 7
+ON CONFLICT (hour, guild_id, channel_id, lang, message_type, is_dm, is_ephemeral)
+DO UPDATE SET sum_chars = EXCLUDED.sum_chars
+"""
+
+# breakdown -> (Gruppierungsspalte, Embed-Titel, max. Gruppen oder None)
+_BREAKDOWNS: dict[str, tuple[str, str, Optional[int]]] = {
+    "by_guild":   ("guild_id",     "Top Guilds (Zeichen)",   20),
+    "by_channel": ("channel_id",   "Top Channels (Zeichen)", 20),
+    "by_lang":    ("lang",         "Nach Sprache",           None),
+    "by_type":    ("message_type", "Nach Nachrichtentyp",    None),
+}
+
+
+# Anzeigename je Gruppen-Schlüssel; get_guild/get_channel sind O(1)-Lookups im Client-Cache
+def _fmt_guild(bot: commands.Bot, key) -> str:
+    if key is None:
+        return "DM"
+    g = bot.get_guild(int(key))
+    return g.name if g else f"Guild {key}"
+
+
+def _fmt_channel(bot: commands.Bot, key) -> str:
+    ch = bot.get_channel(int(key)) if key else None
+    # get_channel liefert auch Threads/Voice-Kanäle → ebenfalls als Mention anzeigen
+    return ch.mention if isinstance(ch, (discord.abc.GuildChannel, discord.Thread)) else f"Channel {key}"
+
+
+_BREAKDOWN_FMT = {
+    "by_guild":   _fmt_guild,
+    "by_channel": _fmt_channel,
+    "by_lang":    lambda _bot, key: key or "—",
+    "by_type":    lambda _bot, key: str(key),
+}
 
 
 class UsageCog(commands.Cog):
@@ -136,30 +200,89 @@ class UsageCog(commands.Cog):
 
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        # Bis zu dieser Stunde (exklusiv) ist output_usage_hourly aktuell; None = nicht nutzen
+        self._hourly_upto: Optional[datetime] = None
         log.info("[USAGE] UsageCog geladen (listeners aktiv)")
 
+    async def cog_load(self):
+        # Ohne DB (DATABASE_URL optional) weder Flusher noch Refresh starten –
+        # sonst loggt jeder Batch/jede Stunde einen Traceback
+        if not db_enabled():
+            return
+        # Gepuffertes Schreiben nach output_usage (COPY statt INSERT pro Nachricht)
+        start_usage_flusher()
+        self.refresh_usage_hourly.start()
+        try:
+            n = await warm_guild_langs()
+            log.info("[USAGE] Sprach-Cache vorgewärmt (%s Guilds)", n)
+        except Exception as e:
+            log.warning("[USAGE] warming lang cache failed: %r", e)
+
+    async def cog_unload(self):
+        try:
+            self.refresh_usage_hourly.cancel()
+        except Exception:
+            pass
+        await stop_usage_flusher()
+
+    @tasks.loop(hours=1)
+    async def refresh_usage_hourly(self):
+        """Aktualisiert die Stunden-Aggregate für /bot_usage (inkrementell)."""
+        # Grenze VOR dem Flush festlegen: Zeilen mit ts < cutoff sind dann entweder schon
+        # geschrieben oder liegen im Puffer, den flush_usage() jetzt leert. _ROLLUP_LAG
+        # deckt Batches ab, die der Flush-Loop gerade noch per COPY schreibt.
+        cutoff = (datetime.now(timezone.utc) - _ROLLUP_LAG).replace(minute=0, second=0, microsecond=0)
+        try:
+            await flush_usage()
+            await execute(_SQL_ROLLUP, cutoff)
+            row = await fetchrow("SELECT max(hour) AS h FROM public.output_usage_hourly")
+        except Exception as e:
+            log.warning("[USAGE] rollup output_usage_hourly failed: %r", e)
+            return
+        # Bis wohin die Tabelle vollständig ist, bestimmt ihr Inhalt, nicht die Uhr
+        self._hourly_upto = row["h"] + _TD_1H if row and row["h"] else None
+
     # 1) Sichtbare Bot-Nachrichten (Channel & DM) loggen
     @commands.Cog.listener()
     async def on_message(self, msg: discord.Message):
         try:
-            bot_id = getattr(self.bot.user, "id", None)
-            is_own_bot_msg = (bot_id is not None and msg.author.id == bot_id)
-            has_interaction = getattr(msg, "interaction", None) is not None
-            is_our_webhook_msg = (msg.webhook_id is not None) and (getattr(msg.author, "bot", False) or has_interaction)
-
-            # Debug: Rohdaten
-            log.debug(
-                "[EVT] on_message id=%s author=%s (bot=%s) webhook_id=%s has_interaction=%s content_len=%s embeds=%s",
-                getattr(msg, "id", "?"),
-                getattr(getattr(msg, "author", None), "id", "?"),
-                getattr(getattr(msg, "author", None), "bot", "?"),
-                getattr(msg, "webhook_id", None),
-                has_interaction,
-                len(msg.content or ""),
-                len(msg.embeds or []),
-            )
-
-            if not (is_own_bot_msg or is_our_webhook_msg):
+            # Fremde Nachrichten sofort verwerfen – on_message feuert für JEDE
+            # Nachricht, die der Bot sieht, geloggt werden nur eigene Ausgaben
+            if msg.webhook_id is None:
+                bot_user = self.bot.user
+                if bot_user is None or msg.author.id != bot_user.id:
+                    return
+                has_interaction = False
+            else:
+                # Interaction-Antworten/Webhooks: nur Bot-Autoren oder mit Interaction
+                has_interaction = getattr(msg, "interaction", None) is not None
+                if not (getattr(msg.author, "bot", False) or has_interaction):
+                    return
+
+            # Debug: Rohdaten (Argumente nur aufbereiten, wenn DEBUG aktiv ist)
+            debug = log.isEnabledFor(logging.DEBUG)
+            if debug:
+                log.debug(
+                    "[EVT] on_message id=%s author=%s (bot=%s) webhook_id=%s has_interaction=%s content_len=%s embeds=%s",
+                    msg.id,
+                    msg.author.id,
+                    getattr(msg.author, "bot", "?"),
+                    msg.webhook_id,
+                    has_interaction,
+                    len(msg.content or ""),
+                    len(msg.embeds or []),
+                )
+
+            content, embeds = msg.content, msg.embeds
+            if not content and not embeds:
+                return  # z. B. reine Anhänge/Sticker
+
+            # Counting vor Kanal-/Empfänger-Infos und Sprach-Lookup (leere Embeds → 0)
+            # Häufigster Fall: reiner Text ohne Embeds → direkt len()
+            chars = total_message_chars(content, embeds) if embeds else len(content)
+            if debug:
+                log.debug("[CNT] computed chars=%s (id=%s)", chars, msg.id)
+            if chars <= 0:
                 return
 
             is_dm = isinstance(msg.channel, (discord.DMChannel, discord.GroupChannel))
@@ -174,25 +297,14 @@ class UsageCog(commands.Cog):
                 except Exception:
                     user_id = None
 
-            # Counting
-            chars = total_message_chars(msg.content, msg.embeds)
-            log.debug("[CNT] computed chars=%s (gid=%s cid=%s is_dm=%s)", chars, guild_id, channel_id, is_dm)
-            if chars <= 0:
-                return
-
             lang = await _guild_lang(guild_id)
 
-            await execute(
-                """
-                INSERT INTO public.output_usage
-                    (ts, guild_id, channel_id, user_id, message_type, chars, lang, is_dm, is_ephemeral)
-                VALUES (now(), $1, $2, $3, $4, $5, $6, $7, $8)
-                """,
+            await log_usage(
                 guild_id, channel_id, user_id,
                 "dm" if is_dm else "channel",
-                int(chars), lang, bool(is_dm), False,
+                chars, lang, is_dm, False,
             )
-            log.info("[INS] +%s chars into output_usage (gid=%s cid=%s dm=%s)", chars, guild_id, channel_id, is_dm)
+            log.info("[INS] +%s chars queued for output_usage (gid=%s cid=%s dm=%s)", chars, guild_id, channel_id, is_dm)
 
         except Exception as e:
             log.exception("[ERR] on_message logging failed: %r", e)
@@ -245,37 +357,79 @@ class UsageCog(commands.Cog):
         include_ephemeral: bool = True,
         breakdown: BreakdownOpt = "total",
     ):
-        if not _owner_only(interaction.user):
+        if interaction.user.id != settings.owner_id:
             await reply_text(interaction, "❌ Nur der Bot-Owner darf diesen Befehl nutzen.", kind="error", ephemeral=True)
             return
 
+        # Eingaben VOR dem defer prüfen: Fehler gehen dann direkt als erste
+        # Antwort raus statt als defer + Follow-up
+        try:
+            start, end, label = _time_window(range, from_iso, to_iso)
+        except ValueError:
+            await reply_text(interaction, "❌ Ungültiges Datum (ISO 8601, z.B. 2025-08-04T00:00:00).", kind="error", ephemeral=True)
+            return
+        if (guild_id and not guild_id.strip().isdecimal()) or (channel_id and not channel_id.strip().isdecimal()):
+            await reply_text(interaction, "❌ Guild-/Channel-ID muss eine Zahl sein.", kind="error", ephemeral=True)
+            return
+        gid = int(guild_id) if guild_id else None
+        cid = int(channel_id) if channel_id else None
+        lang_filter = None if lang == "any" else lang
+
         if not interaction.response.is_done():
             await interaction.response.defer(ephemeral=True)
 
-        start, end, label = _time_window(range, from_iso, to_iso)
-        gid = int(guild_id) if (guild_id and guild_id.isdigit()) else None
-        cid = int(channel_id) if (channel_id and channel_id.isdigit()) else None
-        lang_filter = None if lang == "any" else lang
-        dm_flags = _flag_array(include_dm)
-        eph_flags = _flag_array(include_ephemeral)
-
-        where = """
-          ts BETWEEN $1 AND $2
-          AND ($3::bigint IS NULL OR guild_id = $3)
+        filters = """
+          ($3::bigint IS NULL OR guild_id = $3)
           AND ($4::bigint IS NULL OR channel_id = $4)
           AND ($5::text   IS NULL OR lang      = $5)
-          AND (is_dm = ANY($6::boolean[]))
-          AND (is_ephemeral = ANY($7::boolean[]))
-        """
-        params = [start, end, gid, cid, lang_filter, dm_flags, eph_flags]
-
-        total_row = await fetch(
-            f"SELECT COALESCE(SUM(chars),0) AS total FROM public.output_usage WHERE {where}",
-            *params
-        )
-        total = int(total_row[0]["total"]) if total_row else 0
+        """ + _FLAG_WHERE[(include_dm, include_ephemeral)]
+        params = [start, end, gid, cid, lang_filter]
+
+        # Volle, bereits aggregierte Stunden aus output_usage_hourly lesen,
+        # nur die Ränder des Zeitfensters aus den Rohdaten
+        span = _hourly_span(start, end, self._hourly_upto)
+        if span is None:
+            src = f"public.output_usage WHERE ts BETWEEN $1 AND $2 AND {filters}"
+        else:
+            # Sentinels (0 / '') der Rollup-Tabelle zurück auf NULL (→ "DM", "—")
+            src = f"""(
+                SELECT NULLIF(guild_id, 0) AS guild_id, NULLIF(channel_id, 0) AS channel_id,
+                       NULLIF(lang, '') AS lang, message_type, sum_chars AS chars
+                FROM public.output_usage_hourly
+                WHERE hour >= $6 AND hour < $7 AND {filters}
+                UNION ALL
+                SELECT guild_id, channel_id, lang, message_type, chars
+                FROM public.output_usage
+                WHERE ts BETWEEN $1 AND $2 AND (ts < $6 OR ts >= $7) AND {filters}
+            ) AS u"""
+            params += span
+
+        if breakdown == "total":
+            rows = await fetch(
+                f"SELECT COALESCE(SUM(chars),0) AS sum FROM {src}",
+                *params
+            )
+            total = int(rows[0]["sum"]) if rows else 0
+            groups = []
+        else:
+            col, _, top_n = _BREAKDOWNS[breakdown]
+            # Gesamtsumme + Aufschlüsselung in EINEM Scan: GROUPING SETS liefert die
+            # ()-Zeile (is_total) zusätzlich zu den Gruppen und sortiert sie nach vorn
+            rows = await fetch(
+                f"""
+                SELECT {col} AS grp, COALESCE(SUM(chars),0) AS sum, GROUPING({col}) = 1 AS is_total
+                FROM {src}
+                GROUP BY GROUPING SETS ((), ({col}))
+                ORDER BY GROUPING({col}) DESC, sum DESC
+                {f"LIMIT {top_n + 1}" if top_n else ""}
+                """,
+                *params
+            )
+            total = next((int(r["sum"]) for r in rows if r["is_total"]), 0)
+            groups = [r for r in rows if not r["is_total"]]
+
         log.info("[DASH] total=%s window=%s..%s gid=%s cid=%s lang=%s dm=%s eph=%s",
-                 total, start, end, gid, cid, lang_filter, dm_flags, eph_flags)
+                 total, start, end, gid, cid, lang_filter, include_dm, include_ephemeral)
 
         desc = (
             f"**Zeitraum:** {label}\n"
@@ -299,98 +453,23 @@ class UsageCog(commands.Cog):
         if breakdown == "total":
             return
 
-        if breakdown == "by_guild":
-            rows = await fetch(
-                f"""
-                SELECT guild_id, COALESCE(SUM(chars),0) AS sum
-                FROM public.output_usage
-                WHERE {where}
-                GROUP BY guild_id
-                ORDER BY sum DESC
-                LIMIT 20
-                """,
-                *params
-            )
-            if not rows:
-                await reply_text(interaction, "Keine Daten für diesen Zeitraum/Filter.", ephemeral=True)
-                return
-            lines = []
-            for r in rows:
-                gid_ = r["guild_id"]
-                g = self.bot.get_guild(int(gid_)) if gid_ is not None else None
-                gname = "DM" if gid_ is None else (g.name if g else f"Guild {gid_}")
-                lines.append(f"• **{gname}** — `{int(r['sum']):,}`")
-            emb = make_embed(title="Top Guilds (Zeichen)", description="\n".join(lines), kind="info")
-            await send_embed(interaction, emb, ephemeral=True)
-            return
-
-        if breakdown == "by_channel":
-            rows = await fetch(
-                f"""
-                SELECT channel_id, COALESCE(SUM(chars),0) AS sum
-                FROM public.output_usage
-                WHERE {where}
-                GROUP BY channel_id
-                ORDER BY sum DESC
-                LIMIT 20
-                """,
-                *params
-            )
-            if not rows:
-                await reply_text(interaction, "Keine Daten für diesen Zeitraum/Filter.", ephemeral=True)
-                return
-            lines = []
-            for r in rows:
-                cid_ = r["channel_id"]
-                ch = None
-                if cid_:
-                    for g in self.bot.guilds:
-                        ch = g.get_channel(int(cid_))
-                        if ch:
-                            break
-                cname = ch.mention if isinstance(ch, discord.TextChannel) else f"Channel {cid_}"
-                lines.append(f"• **{cname}** — `{int(r['sum']):,}`")
-            emb = make_embed(title="Top Channels (Zeichen)", description="\n".join(lines), kind="info")
-            await send_embed(interaction, emb, ephemeral=True)
-            return
+        title = _BREAKDOWNS[breakdown][1]
 
-        if breakdown == "by_lang":
-            rows = await fetch(
-                f"""
-                SELECT lang, COALESCE(SUM(chars),0) AS sum
-                FROM public.output_usage
-                WHERE {where}
-                GROUP BY lang
-                ORDER BY sum DESC
-                """,
-                *params
-            )
-            lines = [f"• **{r['lang'] or '—'}** — `{int(r['sum']):,}`" for r in rows] or ["—"]
-            emb = make_embed(title="Nach Sprache", description="\n".join(lines), kind="info")
-            await send_embed(interaction, emb, ephemeral=True)
+        if not groups and breakdown in ("by_guild", "by_channel"):
+            await reply_text(interaction, "Keine Daten für diesen Zeitraum/Filter.", ephemeral=True)
             return
 
-        if breakdown == "by_type":
-            rows = await fetch(
-                f"""
-                SELECT message_type, COALESCE(SUM(chars),0) AS sum
-                FROM public.output_usage
-                WHERE {where}
-                GROUP BY message_type
-                ORDER BY sum DESC
-                """,
-                *params
-            )
-            lines = [f"• **{r['message_type']}** — `{int(r['sum']):,}`" for r in rows] or ["—"]
-            emb = make_embed(title="Nach Nachrichtentyp", description="\n".join(lines), kind="info")
-            await send_embed(interaction, emb, ephemeral=True)
-            return
+        fmt_key = _BREAKDOWN_FMT[breakdown]
+        bot = self.bot
+        desc = "\n".join(f"• **{fmt_key(bot, r['grp'])}** — `{int(r['sum']):,}`" for r in groups) or "—"
+        emb = make_embed(title=title, description=desc, kind="info")
+        await send_embed(interaction, emb, ephemeral=True)
 
     # 3) Diagnose: prüft Intents, erzeugt Test-Output, schreibt Test-Row
     @app_commands.command(name="usage_diag", description="(Owner) Diagnose für Usage-Logging.")
     @app_commands.describe(post_test_message="Sichtbare Testnachricht im aktuellen Kanal posten?")
     async def usage_diag(self, interaction: discord.Interaction, post_test_message: bool = True):
-        if not _owner_only(interaction.user):
+        if interaction.user.id != settings.owner_id:
             await reply_text(interaction, "❌ Nur der Bot-Owner.", kind="error", ephemeral=True)
             return
 
@@ -415,20 +494,17 @@ class UsageCog(commands.Cog):
 
         # (B) direkte Testzeile in DB inserten (um DB-Pfad zu prüfen)
         try:
-            await execute(
-                """
-                INSERT INTO public.output_usage
-                    (ts, guild_id, channel_id, user_id, message_type, chars, lang, is_dm, is_ephemeral)
-                VALUES (now(), $1, $2, $3, 'channel', 7, 'de', false, false)
-                """,
-                interaction.guild_id, interaction.channel_id, interaction.user.id
+            await insert_usage(
+                interaction.guild_id, interaction.channel_id, interaction.user.id,
+                "channel", 7, "de", False, False,
             )
             db_ok = True
         except Exception as e:
             db_ok = False
             log.exception("[DIAG] direct insert failed: %r", e)
 
-        # (C) Summen abfragen (letzte 10min)
+        # (C) Summen abfragen (letzte 10min) – vorher Puffer leeren, damit die Testnachricht drin ist
+        await flush_usage()
         start = datetime.now(timezone.utc) - timedelta(minutes=10)
         rows = await fetch(
             "SELECT COUNT(*) AS n_rows, COALESCE(SUM(chars),0) AS sum FROM public.output_usage WHERE ts >= $1",
@@ -2,7 +2,9 @@
 from __future__ import annotations
 import asyncio
 import json
+import time
 from datetime import datetime
+from operator import itemgetter
 from typing import Optional, Dict
 
 import discord
@@ -10,8 +12,9 @@ from discord import app_commands
 from discord.ext import commands
 from zoneinfo import ZoneInfo
 
-from ..services.guild_config import get_guild_cfg, update_guild_cfg
+from ..services.guild_config import get_guild_cfg, update_guild_cfg, get_guild_lang
 from ..services.translation import translate_text_for_guild
+from ..services.vc_overrides import get_vc_override, invalidate_vc_override
 from ..utils.replies import make_embed, reply_text, send_embed, tracked_send  # ← tracked_send hinzu
 from ..utils.checks import require_manage_guild
 from ..db import fetchrow, execute, fetch
@@ -25,50 +28,128 @@ from ..db import fetchrow, execute, fetch
 #   'started_by_id': int,
 #   'started_at': datetime,
 #   'accum': {user_id: seconds},
-#   'running': {user_id: datetime_start},
+#   'running': {user_id: time.monotonic() beim Join},
+#   '_names': {user_id: display_name},   # beim Join gemerkt, on_member_update aktualisiert
 #   'message': discord.Message | None,
 #   'task': asyncio.Task | None,
-#   'override_ids': list[int],
+#   'override_ids': frozenset[int],
+#   '_dirty': asyncio.Event,   # gesetzt bei Join/Leave → Live-Embed zeitnah neu rendern
+#   '_edit_lock': asyncio.Lock, # höchstens ein Message-Edit gleichzeitig
 # }
 vc_live_sessions: Dict[int, Dict] = {}
 
+# Live-Embed: nach Join/Leave spätestens nach LIVE_MIN_INTERVAL Sekunden (Rate-Limit-Boden),
+# ohne Ereignis alle LIVE_MAX_INTERVAL Sekunden (laufende Zeiten weiterzählen).
+LIVE_MIN_INTERVAL = 2.0
+LIVE_MAX_INTERVAL = 5.0
+
 def _fmt_dur(total_seconds: int) -> str:
-    h = total_seconds // 3600
-    m = (total_seconds % 3600) // 60
-    s = total_seconds % 60
+    h, rem = divmod(total_seconds, 3600)
+    m, s = divmod(rem, 60)
     return f"{h:02d}:{m:02d}:{s:02d}"
 
+_BERLIN = ZoneInfo("Europe/Berlin")
+
 def _now() -> datetime:
-    return datetime.now(tz=ZoneInfo("Europe/Berlin"))
+    # Nur für angezeigte Zeitpunkte; Dauern laufen über time.monotonic()
+    return datetime.now(tz=_BERLIN)
+
+# Übersetzte Labels pro (lang, deutscher Text). Die Label-Menge ist konstant,
+# nach dem ersten Render pro Sprache also keine DeepL-/DB-Zugriffe mehr.
+_label_cache: Dict[tuple[str, str], str] = {}
+# Laufende Übersetzungen pro Key: gleichzeitige Renders (kalter Cache, mehrere Sessions)
+# teilen sich einen DeepL-Call statt N parallele abzusetzen
+_label_inflight: Dict[tuple[str, str], asyncio.Task] = {}
+
+async def _fetch_label(guild_id: int, key: tuple[str, str]) -> str:
+    lang, text_de = key
+    text = await translate_text_for_guild(guild_id, text_de)
+    # DeepL-Fehler fallen auf DE zurück → dann nicht dauerhaft cachen
+    if lang != "en" or text != text_de:
+        _label_cache[key] = text
+    return text
+
+async def _tr(guild_id: int, text_de: str) -> str:
+    lang = await get_guild_lang(guild_id)
+    key = (lang, text_de)
+    hit = _label_cache.get(key)
+    if hit is not None:
+        return hit
+    task = _label_inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_fetch_label(guild_id, key))
+        _label_inflight[key] = task
+        task.add_done_callback(lambda _t: _label_inflight.pop(key, None))
+    # shield: bricht ein Aufrufer ab, läuft der gemeinsame Call für die anderen weiter
+    return await asyncio.shield(task)
+
+def _has_override(member: discord.Member, override_ids: frozenset[int]) -> bool:
+    # Member._roles (discord.py-intern, SnowflakeList der Rollen-IDs) statt member.roles:
+    # spart das Auflösen + Sortieren aller Role-Objekte pro Member und Event.
+    # Geprüft gegen discord.py 2.5.2 (requirements.txt) – bei Upgrades erneut prüfen.
+    # _roles enthält @everyone (ID == Guild-ID) NICHT, member.roles schon → separat testen.
+    return member.guild.id in override_ids or not override_ids.isdisjoint(member._roles)
+
+def _any_override(vc: discord.VoiceChannel, override_ids: frozenset[int]) -> bool:
+    """Ist noch jemand mit Override-Rolle im Channel?"""
+    # voice_states liefert nur IDs → keine Member-Liste aufbauen, Member nur einzeln nachschlagen
+    guild = vc.guild
+    for uid in vc.voice_states:
+        m = guild.get_member(uid)
+        if m is not None and _has_override(m, override_ids):
+            return True
+    return False
+
+async def _set_target_connect(vc: discord.VoiceChannel, target_ids, connect: bool) -> None:
+    """
+    CONNECT für alle Ziel-Rollen setzen (view_channel bleibt erhalten).
+    Bewusst ein set_permissions pro Rolle statt EINEM channel.edit(overwrites=...):
+    der Bulk-Edit schreibt den kompletten (gecachten) Overwrite-Satz zurück und würde
+    zwischenzeitliche Änderungen an anderen Rollen/Membern still zurückdrehen.
+    Rollen, deren Overwrite bereits passt, lösen keinen REST-Call aus.
+    """
+    for rid in target_ids:
+        role = vc.guild.get_role(rid)
+        if role is None:
+            continue
+        over = vc.overwrites_for(role)
+        if over == discord.PermissionOverwrite(connect=connect, view_channel=over.view_channel):
+            continue
+        await vc.set_permissions(role, connect=connect, view_channel=over.view_channel)
+
+def _session_totals(session: dict) -> Dict[int, int]:
+    """Sekunden pro User (gesammelt + laufend) zum aktuellen Zeitpunkt."""
+    totals: Dict[int, int] = dict(session["accum"])
+    now = time.monotonic()
+    for uid, t0 in session["running"].items():
+        totals[uid] = totals.get(uid, 0) + int(now - t0)
+    return totals
+
+def _render_sig(session: dict, totals: Dict[int, int]) -> tuple:
+    """Signatur des sichtbaren Inhalts – gleich → Edit kann entfallen."""
+    return (session.get("task") is not None, tuple(sorted(totals.items())))
+
+def _presence_text(names: Dict[int, str], totals: Dict[int, int]) -> str:
+    """Anwesenheitsliste, sortiert (Top zuerst); Namen aus dem Session-Cache."""
+    if not totals:
+        return "—"
+    return "\n".join(
+        f"• **{names.get(uid) or f'User {uid}'}** – `{_fmt_dur(secs)}`"
+        for uid, secs in sorted(totals.items(), key=itemgetter(1), reverse=True)
+    )
 
-async def _render_embed_payload(session: dict) -> discord.Embed:
+async def _render_embed_payload(session: dict, totals: Optional[Dict[int, int]] = None) -> discord.Embed:
     """
     Baut ein (bereits übersetztes) Embed für die aktuelle Session.
     Titel/Labels/Texte werden per DeepL in die Guild-Sprache übersetzt.
     """
     # Objekte besorgen
-    guild = discord.utils.get(bot.guilds, id=session["guild_id"])
+    guild = bot.get_guild(session["guild_id"])
     vc: Optional[discord.VoiceChannel] = guild.get_channel(session["channel_id"]) if guild else None
     started_by: Optional[discord.Member] = guild.get_member(session["started_by_id"]) if guild else None
 
-    now = _now()
-    totals: Dict[int, int] = {}
-
-    # Gesammelte Sekunden
-    for uid, secs in session["accum"].items():
-        totals[uid] = secs
-
-    # Laufende Zeiten addieren
-    for uid, t0 in session["running"].items():
-        add = int((now - t0).total_seconds())
-        totals[uid] = totals.get(uid, 0) + max(0, add)
-
-    # Zeilen sortiert (Top zuerst)
-    lines = []
-    for uid, secs in sorted(totals.items(), key=lambda x: x[1], reverse=True):
-        member = guild.get_member(uid) if guild else None
-        name = member.display_name if member else f"User {uid}"
-        lines.append(f"• **{name}** – `{_fmt_dur(secs)}`")
+    if totals is None:
+        totals = _session_totals(session)
 
     # Titel/Labels (DE → EN via DeepL je nach Guild)
     title_live_de = "🎙️ Voice-Session (LIVE)"
@@ -78,14 +159,12 @@ async def _render_embed_payload(session: dict) -> discord.Embed:
     triggered_de = "Getriggert von"
     presence_de = "Anwesenheit"
     footer_de = "Die Liste aktualisiert sich live, solange eine Override-Rolle im Channel ist."
-    # Übersetzen
+    # Übersetzen (parallel statt sechs Roundtrips nacheinander)
     title_de = title_live_de if session.get("task") else title_final_de
-    title = await translate_text_for_guild(session["guild_id"], title_de)
-    lbl_started = await translate_text_for_guild(session["guild_id"], started_de)
-    lbl_channel = await translate_text_for_guild(session["guild_id"], channel_de)
-    lbl_triggered = await translate_text_for_guild(session["guild_id"], triggered_de)
-    lbl_presence = await translate_text_for_guild(session["guild_id"], presence_de)
-    footer = await translate_text_for_guild(session["guild_id"], footer_de)
+    gid = session["guild_id"]
+    title, lbl_started, lbl_channel, lbl_triggered, lbl_presence, footer = await asyncio.gather(
+        *(_tr(gid, s) for s in (title_de, started_de, channel_de, triggered_de, presence_de, footer_de))
+    )
 
     emb = make_embed(
         title=title,
@@ -104,27 +183,60 @@ async def _render_embed_payload(session: dict) -> discord.Embed:
         value=started_at.strftime("%d.%m.%Y %H:%M:%S"),
         inline=True
     )
-    emb.add_field(name=lbl_presence, value=("\n".join(lines) if lines else "—"), inline=False)
+    emb.add_field(name=lbl_presence, value=_presence_text(session["_names"], totals), inline=False)
     emb.set_footer(text=footer)
     return emb
 
+async def _live_embed(session: dict, totals: Optional[Dict[int, int]] = None) -> discord.Embed:
+    """
+    Live-Embed der Session: Titel/Labels/Kanal/Starter ändern sich während der Session nicht,
+    daher einmal bauen (inkl. Übersetzung) und danach nur das Anwesenheits-Feld ersetzen.
+    """
+    if totals is None:
+        totals = _session_totals(session)
+    base: Optional[discord.Embed] = session.get("_base_embed")
+    if base is None:
+        base = session["_base_embed"] = await _render_embed_payload(session, totals)
+        return base
+    idx = len(base.fields) - 1
+    base.set_field_at(idx, name=base.fields[idx].name, value=_presence_text(session["_names"], totals), inline=False)
+    return base
+
+def _mark_dirty(session: dict) -> None:
+    ev: Optional[asyncio.Event] = session.get("_dirty")
+    if ev is not None:
+        ev.set()
+
 async def _update_live_message(session: dict):
+    dirty: asyncio.Event = session["_dirty"]
     try:
-        while session.get("task") is not None:
+        # Abbruch auch, wenn die Session von außen entfernt wurde (_drop_session)
+        while session.get("task") is not None and vc_live_sessions.get(session["channel_id"]) is session:
             msg: Optional[discord.Message] = session.get("message")
             if msg:
-                emb = await _render_embed_payload(session)
-                try:
-                    await msg.edit(embed=emb)
-                except discord.NotFound:
-                    break
-            await asyncio.sleep(5)
+                # Unveränderter Stand (z. B. niemand läuft mehr mit) → kein Render, kein REST-Call
+                totals = _session_totals(session)
+                sig = _render_sig(session, totals)
+                if sig != session.get("_last_sig"):
+                    async with session["_edit_lock"]:
+                        emb = await _live_embed(session, totals)
+                        try:
+                            await msg.edit(embed=emb)
+                        except discord.NotFound:
+                            break
+                    session["_last_sig"] = sig
+            # Bursts von Join/Leave zu einem Edit bündeln
+            await asyncio.sleep(LIVE_MIN_INTERVAL)
+            try:
+                await asyncio.wait_for(dirty.wait(), LIVE_MAX_INTERVAL - LIVE_MIN_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            dirty.clear()
     finally:
         session["task"] = None
 
-async def _start_or_attach_session(member: discord.Member, vc: discord.VoiceChannel, override_ids: list[int]):
+async def _start_or_attach_session(member: discord.Member, vc: discord.VoiceChannel, override_ids: frozenset[int]):
     sid = vc.id
-    now = _now()
     sess = vc_live_sessions.get(sid)
 
     # Log-Kanal aus guild_settings (Spalte: vc_log_channel)
@@ -137,12 +249,15 @@ async def _start_or_attach_session(member: discord.Member, vc: discord.VoiceChan
             "guild_id": member.guild.id,
             "channel_id": vc.id,
             "started_by_id": member.id,
-            "started_at": now,
+            "started_at": _now(),  # nur für die Anzeige
             "accum": {},
             "running": {},
+            "_names": {},
             "message": None,
             "task": None,
             "override_ids": override_ids,
+            "_dirty": asyncio.Event(),
+            "_edit_lock": asyncio.Lock(),
         }
         vc_live_sessions[sid] = sess
 
@@ -169,61 +284,90 @@ async def _start_or_attach_session(member: discord.Member, vc: discord.VoiceChan
         sess["message"] = msg
         sess["task"] = bot.loop.create_task(_update_live_message(sess))
 
-    # Member laufend markieren (Re-Join zählt weiter)
+    _attach_member(sess, member)
+
+def _attach_member(sess: dict, member: discord.Member) -> None:
+    """Member laufend markieren (Re-Join zählt weiter) und Anzeigenamen merken."""
     if member.id not in sess["running"]:
-        sess["running"][member.id] = now
+        sess["running"][member.id] = time.monotonic()
     sess["accum"].setdefault(member.id, 0)
+    sess["_names"][member.id] = member.display_name
+    _mark_dirty(sess)
 
-async def _handle_leave(member: discord.Member, vc: discord.VoiceChannel, override_ids: list[int]):
+async def _handle_leave(member: discord.Member, vc: discord.VoiceChannel, override_ids: frozenset[int]):
     sid = vc.id
     sess = vc_live_sessions.get(sid)
     if not sess:
         return
 
     t0 = sess["running"].pop(member.id, None)
-    if t0:
-        add = int((_now() - t0).total_seconds())
+    if t0 is not None:
+        add = int(time.monotonic() - t0)
         if add > 0:
             sess["accum"][member.id] = sess["accum"].get(member.id, 0) + add
 
     # Ist noch eine Override-Rolle im Channel?
-    still_override = any(any(r.id in override_ids for r in m.roles) for m in vc.members)
+    still_override = _any_override(vc, override_ids)
     if still_override:
+        _mark_dirty(sess)
+        return
+
+    # Session finalisieren: Restzeiten addieren
+    sess["accum"] = _session_totals(sess)
+    sess["running"].clear()
+
+    # Live-Task stoppen – unter dem Edit-Lock, damit ein gerade laufender Live-Edit
+    # abgeschlossen ist und das Final-Embed nicht mehr überschreiben kann
+    async with sess["_edit_lock"]:
+        if vc_live_sessions.get(sid) is not sess:
+            return  # parallel bereits finalisiert
+        task = sess.get("task")
+        if task:
+            task.cancel()
+            sess["task"] = None
+
+        # Finales Embed (Titel/Footers anpassen)
         if sess.get("message"):
             try:
-                emb = await _render_embed_payload(sess)
-                await sess["message"].edit(embed=emb)
+                final_emb = await _render_embed_payload(sess)
+                # Titel/Footers bereits übersetzt, nur Inhalte ändern:
+                title_final_de = "🧾 Voice-Session (Abschluss)"
+                footer_final_de = "Session beendet – letzte Override-Rolle hat den Channel verlassen."
+                final_title, final_footer = await asyncio.gather(
+                    _tr(sess["guild_id"], title_final_de), _tr(sess["guild_id"], footer_final_de)
+                )
+                final_emb.title = final_title
+                final_emb.set_footer(text=final_footer)
+                await sess["message"].edit(embed=final_emb)
             except discord.NotFound:
                 pass
-        return
 
-    # Session finalisieren: Restzeiten addieren
-    now = _now()
-    for uid, t0 in list(sess["running"].items()):
-        add = int((now - t0).total_seconds())
-        sess["accum"][uid] = sess["accum"].get(uid, 0) + max(0, add)
-    sess["running"].clear()
+    vc_live_sessions.pop(sid, None)
 
-    # Live-Task stoppen
+def _drop_session(sid: int) -> None:
+    """Session ohne Final-Embed verwerfen (Guild verlassen / Channel gelöscht)."""
+    sess = vc_live_sessions.pop(sid, None)
+    if sess is None:
+        return
     task = sess.get("task")
     if task:
         task.cancel()
-        sess["task"] = None
-
-    # Finales Embed (Titel/Footers anpassen)
-    if sess.get("message"):
-        try:
-            final_emb = await _render_embed_payload(sess)
-            # Titel/Footers bereits übersetzt, nur Inhalte ändern:
-            title_final_de = "🧾 Voice-Session (Abschluss)"
-            footer_final_de = "Session beendet – letzte Override-Rolle hat den Channel verlassen."
-            final_emb.title = await translate_text_for_guild(sess["guild_id"], title_final_de)
-            final_emb.set_footer(text=await translate_text_for_guild(sess["guild_id"], footer_final_de))
-            await sess["message"].edit(embed=final_emb)
-        except discord.NotFound:
-            pass
-
-    vc_live_sessions.pop(sid, None)
+    sess["task"] = None
+    sess["_base_embed"] = None
+
+def _refresh_cached_name(uid: int) -> None:
+    """Anzeigenamen eines Teilnehmers in allen laufenden Sessions neu auflösen."""
+    for sess in vc_live_sessions.values():
+        names = sess["_names"]
+        if uid not in names:
+            continue
+        guild = bot.get_guild(sess["guild_id"])
+        member = guild.get_member(uid) if guild else None
+        if member is None or names[uid] == member.display_name:
+            continue
+        names[uid] = member.display_name
+        sess["_last_sig"] = None
+        _mark_dirty(sess)
 
 class VcTrackingOverrideCog(commands.Cog):
     def __init__(self, bot_: commands.Bot):
@@ -312,6 +456,7 @@ class VcTrackingOverrideCog(commands.Cog):
             json.dumps(override_ids),
             json.dumps(target_ids),
         )
+        invalidate_vc_override(interaction.guild.id, channel.id)
 
         # 5) ACK
         log_id = (await get_guild_cfg(interaction.guild.id)).get("vc_log_channel")
@@ -350,13 +495,6 @@ class VcTrackingOverrideCog(commands.Cog):
                 ephemeral=True,
             )
 
-        # Helper zum Dekodieren
-        def _to_list(raw):
-            try:
-                return json.loads(raw) if isinstance(raw, str) else (raw or [])
-            except Exception:
-                return []
-
         # Schickes Embed bauen
         emb = make_embed(
             title="🔧 vc_override – Konfiguration",
@@ -376,8 +514,9 @@ class VcTrackingOverrideCog(commands.Cog):
             ch = interaction.guild.get_channel(r["channel_id"])
             ch_name = ch.mention if isinstance(ch, discord.VoiceChannel) else f"<#{r['channel_id']}>"
 
-            override_ids = _to_list(r["override_roles"])
-            target_ids   = _to_list(r["target_roles"])
+            # JSONB kommt dank Codec (db.py) bereits als Liste
+            override_ids = r["override_roles"] or []
+            target_ids   = r["target_roles"] or []
 
             def fmt_roles(ids):
                 parts = []
@@ -401,6 +540,31 @@ class VcTrackingOverrideCog(commands.Cog):
         # über send_embed → Ephemeral-Logging greift
         return await send_embed(interaction, emb, ephemeral=True)
 
+    # ---------- Listener: Aufräumen verwaister Sessions ------------------
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        for sid in [sid for sid, s in vc_live_sessions.items() if s["guild_id"] == guild.id]:
+            _drop_session(sid)
+        invalidate_vc_override(guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel):
+        _drop_session(channel.id)
+        invalidate_vc_override(channel.guild.id, channel.id)
+
+    @commands.Cog.listener()
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        # Nick-Änderung (Guild-Ebene) von Session-Teilnehmern im Namens-Cache nachziehen
+        if before.display_name != after.display_name:
+            _refresh_cached_name(after.id)
+
+    @commands.Cog.listener()
+    async def on_user_update(self, before: discord.User, after: discord.User):
+        # global_name/Username ändern sich auf User-Ebene – dafür feuert on_member_update
+        # nicht, display_name der Member ändert sich aber ggf. mit
+        if before.display_name != after.display_name:
+            _refresh_cached_name(after.id)
+
     # ---------- Listener: Override + Live-Tracking ------------------------
     @commands.Cog.listener()
     async def on_voice_state_update(self, member: discord.Member, before: discord.VoiceState, after: discord.VoiceState):
@@ -420,59 +584,24 @@ class VcTrackingOverrideCog(commands.Cog):
         if vc is None:
             return
 
-        # 3) Override-Config für genau diesen Channel auslesen
-        row = await fetchrow(
-            """
-            SELECT override_roles, target_roles
-              FROM vc_overrides
-             WHERE guild_id   = $1
-               AND channel_id = $2
-            """,
-            member.guild.id,
-            vc.id
-        )
-        if not row:
-            return  # kein Override für diesen Channel
-
-        # 4) JSONB → Python-Listen
-        def _to_list(raw):
-            try:
-                return json.loads(raw) if isinstance(raw, str) else (raw or [])
-            except Exception:
-                return []
-
-        override_ids = _to_list(row["override_roles"])
-        target_ids   = _to_list(row["target_roles"])
-        if not override_ids or not target_ids:
-            return  # schlechte/fehlende Konfiguration
+        # 3+4) Override-Config für genau diesen Channel (gecacht, bereits geparst;
+        #      override_ids als frozenset → O(1)-Lookup pro Rolle)
+        cfg = await get_vc_override(member.guild.id, vc.id)
+        if cfg is None:
+            return  # kein Override bzw. schlechte/fehlende Konfiguration
+        override_ids, target_ids = cfg
 
         # 5) Prüfen, ob der Member eine Override-Rolle hat
-        member_is_override = any(r.id in override_ids for r in member.roles)
+        member_is_override = _has_override(member, override_ids)
 
         # 6) Rechte-Management
         if joined:
-            for rid in target_ids:
-                role = member.guild.get_role(rid)
-                if role:
-                    over = vc.overwrites_for(role)
-                    await vc.set_permissions(
-                        role,
-                        connect=True,
-                        view_channel=over.view_channel
-                    )
+            await _set_target_connect(vc, target_ids, True)
         elif left:
             # nur sperren, wenn letzte Override-Person gegangen ist
-            still_override = any(any(r.id in override_ids for r in m.roles) for m in vc.members)
+            still_override = _any_override(vc, override_ids)
             if not still_override:
-                for rid in target_ids:
-                    role = member.guild.get_role(rid)
-                    if role:
-                        over = vc.overwrites_for(role)
-                        await vc.set_permissions(
-                            role,
-                            connect=False,
-                            view_channel=over.view_channel
-                        )
+                await _set_target_connect(vc, target_ids, False)
 
         # 7) Live-Tracking
         # JOIN
@@ -485,16 +614,7 @@ class VcTrackingOverrideCog(commands.Cog):
                 # Kein Override: nur anhängen, falls bereits Session läuft
                 sess = vc_live_sessions.get(vc.id)
                 if sess is not None:
-                    now = _now()
-                    if member.id not in sess["running"]:
-                        sess["running"][member.id] = now
-                    sess["accum"].setdefault(member.id, 0)
-                    if sess.get("message"):
-                        try:
-                            emb = await _render_embed_payload(sess)
-                            await sess["message"].edit(embed=emb)
-                        except discord.NotFound:
-                            pass
+                    _attach_member(sess, member)
             return
 
         # LEAVE
@@ -1,10 +1,31 @@
 # bot/db.py
+import json
 from typing import Optional
 import asyncpg
 from .config import settings
 
 _pool: Optional[asyncpg.Pool] = None
 
+# JSONB direkt im Treiber dekodieren → Lesende bekommen dict/list statt str.
+# orjson (optional) ist deutlich schneller; sonst stdlib.
+try:
+    import orjson
+
+    _jsonb_decode = orjson.loads
+except ImportError:
+    _jsonb_decode = json.loads
+
+
+def _jsonb_encode(value) -> str:
+    # Bestehender Code übergibt bereits serialisierte Strings (json.dumps(...)) → durchreichen
+    return value if isinstance(value, str) else json.dumps(value)
+
+
+async def _init_conn(conn: asyncpg.Connection) -> None:
+    await conn.set_type_codec(
+        "jsonb", encoder=_jsonb_encode, decoder=_jsonb_decode, schema="pg_catalog",
+    )
+
 
 async def init_db():
     """
@@ -23,6 +44,7 @@ async def init_db():
         dsn=settings.database_url,
         min_size=1,
         max_size=5,
+        init=_init_conn,
     )
 
     async with _pool.acquire() as conn:
@@ -71,9 +93,130 @@ async def init_db():
           DROP COLUMN IF EXISTS joined_at;
         """)
 
+        # --- bot_bans (permanente Bot-Bans) ----------------------------------
+        # Eindeutigkeit auf guild_id ist Pflicht: /bot_ban nutzt ON CONFLICT (guild_id).
+        await conn.execute("""
+        CREATE TABLE IF NOT EXISTS public.bot_bans (
+          guild_id BIGINT      PRIMARY KEY,
+          reason   TEXT,
+          added_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        );
+        """)
+        # Bestehende Tabellen (außerhalb des Repos angelegt) haben evtl. keinen
+        # Unique-Key → einmalig nachrüsten: nur wenn noch KEIN Unique-Index auf genau
+        # (guild_id) existiert (frische Installationen haben den PK), Duplikate entfernen
+        # (neuester added_at bleibt) und Unique-Index anlegen.
+        await conn.execute("""
+        DO $$
+        BEGIN
+          IF NOT EXISTS (
+            SELECT 1
+              FROM pg_index i
+              JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = i.indkey[0]
+             WHERE i.indrelid = 'public.bot_bans'::regclass
+               AND i.indisunique
+               AND i.indnkeyatts = 1
+               AND i.indpred IS NULL
+               AND a.attname = 'guild_id'
+          ) THEN
+            DELETE FROM public.bot_bans
+             WHERE ctid IN (
+               SELECT ctid FROM (
+                 SELECT ctid,
+                        row_number() OVER (PARTITION BY guild_id ORDER BY added_at DESC NULLS LAST) AS rn
+                   FROM public.bot_bans
+               ) d
+               WHERE d.rn > 1
+             );
+            CREATE UNIQUE INDEX bot_bans_guild_id_key ON public.bot_bans (guild_id);
+          END IF;
+        END $$;
+        """)
+        # /bot_bans sortiert nach added_at DESC → Index-Scan statt Sort über die ganze Tabelle
+        await conn.execute("""
+        CREATE INDEX IF NOT EXISTS bot_bans_added_at_desc_idx
+          ON public.bot_bans (added_at DESC);
+        """)
+
+        # --- vote_reminders (Owner-Vote-Reminder, vom Scheduler gepollt) -------
+        await conn.execute("""
+        CREATE TABLE IF NOT EXISTS public.vote_reminders (
+          channel_id   BIGINT      PRIMARY KEY,
+          guild_id     BIGINT      NOT NULL,
+          interval_s   INTEGER     NOT NULL,
+          next_fire_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        );
+        """)
+
+        # --- output_usage (Usage-Logging: Zeichen sichtbarer Bot-Ausgaben) ----
+        await conn.execute("""
+        CREATE TABLE IF NOT EXISTS public.output_usage (
+          ts           TIMESTAMPTZ NOT NULL DEFAULT now(),
+          guild_id     BIGINT,
+          channel_id   BIGINT,
+          user_id      BIGINT,
+          message_type TEXT        NOT NULL,
+          chars        INTEGER     NOT NULL,
+          lang         TEXT,
+          is_dm        BOOLEAN     NOT NULL DEFAULT false,
+          is_ephemeral BOOLEAN     NOT NULL DEFAULT false
+        );
+        """)
+        # Die Tabelle wächst append-only nach ts → BRIN für Zeitfenster (winzig, billig
+        # zu pflegen); der B-Tree deckt die /bot_usage-Filter ab und enthält chars,
+        # sodass SUM(chars) per Index-Only-Scan beantwortet werden kann.
+        await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_output_usage_ts_brin
+          ON public.output_usage USING BRIN (ts) WITH (pages_per_range = 32);
+        """)
+        await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_output_usage_filter
+          ON public.output_usage (ts, guild_id, channel_id, lang)
+          INCLUDE (chars, is_dm, is_ephemeral);
+        """)
+        # /bot_usage mit guild_id-Filter: Guild zuerst, dann Zeitfenster (DMs ausgenommen)
+        await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_output_usage_gid_ts
+          ON public.output_usage (guild_id, ts)
+          WHERE guild_id IS NOT NULL;
+        """)
+
+        # Stündlich voraggregiert für /bot_usage (Rollup: UsageCog.refresh_usage_hourly).
+        # Tabelle statt Materialized View: der Rollup aggregiert nur die jüngsten Stunden
+        # nach, statt bei jedem Refresh ganz output_usage neu zu rechnen. Schlüsselspalten
+        # sind NOT NULL (Sentinels 0 / '' statt NULL), sonst greift ON CONFLICT nicht.
+        # Ältere Installationen hatten hier eine Materialized View → einmalig ersetzen.
+        await conn.execute("""
+        DO $$
+        BEGIN
+          IF EXISTS (SELECT 1 FROM pg_matviews
+                      WHERE schemaname = 'public' AND matviewname = 'output_usage_hourly') THEN
+            DROP MATERIALIZED VIEW public.output_usage_hourly;
+          END IF;
+        END $$;
+        """)
+        await conn.execute("""
+        CREATE TABLE IF NOT EXISTS public.output_usage_hourly (
+          hour         TIMESTAMPTZ NOT NULL,
+          guild_id     BIGINT      NOT NULL DEFAULT 0,   -- 0  = DM / unbekannt
+          channel_id   BIGINT      NOT NULL DEFAULT 0,   -- 0  = unbekannt
+          lang         TEXT        NOT NULL DEFAULT '',  -- '' = unbekannt
+          message_type TEXT        NOT NULL,
+          is_dm        BOOLEAN     NOT NULL,
+          is_ephemeral BOOLEAN     NOT NULL,
+          sum_chars    BIGINT      NOT NULL,
+          PRIMARY KEY (hour, guild_id, channel_id, lang, message_type, is_dm, is_ephemeral)
+        );
+        """)
+
     return _pool
 
 
+def db_enabled() -> bool:
+    """True, wenn init_db() einen Pool angelegt hat (DATABASE_URL gesetzt)."""
+    return _pool is not None
+
+
 async def get_pool() -> asyncpg.Pool:
     if _pool is None:
         raise RuntimeError("DB not initialized. Call init_db() first (and set DATABASE_URL).")
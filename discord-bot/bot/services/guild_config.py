@@ -1,8 +1,10 @@
 # bot/services/guild_config.py
 from __future__ import annotations
 import json
-from typing import Dict, Any
-from ..db import fetchrow, execute
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+from ..db import fetch, fetchrow, execute
 
 # Diese Legacy-Spalten bleiben wie gehabt in einzelnen DB-Spalten
 LEGACY_COLS = {
@@ -21,6 +23,54 @@ SELECT_COLS = (
     "templates, default_role, vc_log_channel, lang, tz, settings"
 )
 
+# Sprach-Cache (guild_id -> (monotonic-Zeitstempel, lang)) für heiße Pfade wie das
+# Usage-Logging, das pro Bot-Nachricht die Guild-Sprache braucht. LRU + TTL,
+# update_guild_cfg(lang=...) invalidiert den Eintrag sofort.
+_LANG_TTL = 300.0
+_LANG_CACHE_MAX = 10_000
+_lang_cache: "OrderedDict[int, tuple[float, str]]" = OrderedDict()
+_NO_EXPIRY = float("inf")  # monotonic() - inf < TTL → Eintrag bleibt gültig
+
+
+def cached_guild_lang(guild_id: int) -> Optional[str]:
+    """Sprache aus dem Cache (ohne await); None, wenn nicht (mehr) gecacht."""
+    hit = _lang_cache.get(guild_id)
+    if hit is None or time.monotonic() - hit[0] >= _LANG_TTL:
+        return None
+    _lang_cache.move_to_end(guild_id)
+    return hit[1]
+
+
+async def get_guild_lang(guild_id: int) -> str:
+    """Sprache der Guild (lowercase, Default 'de'); DB-Zugriff nur bei Cache-Miss."""
+    lang = cached_guild_lang(guild_id)
+    if lang is not None:
+        return lang
+    cfg = await get_guild_cfg(guild_id)
+    lang = str(cfg.get("lang") or "de").lower()
+    _lang_cache[guild_id] = (time.monotonic(), lang)
+    _lang_cache.move_to_end(guild_id)
+    if len(_lang_cache) > _LANG_CACHE_MAX:
+        _lang_cache.popitem(last=False)
+    return lang
+
+
+def invalidate_guild_lang(guild_id: int) -> None:
+    _lang_cache.pop(guild_id, None)
+
+
+async def warm_guild_langs() -> int:
+    """
+    Lädt die Sprachen aller Guilds mit EINER Abfrage in den Cache.
+    Vorgeladene Einträge laufen nicht ab (Zeitstempel +inf) – Sprachwechsel
+    invalidiert update_guild_cfg ohnehin, danach gilt wieder die normale TTL.
+    """
+    rows = await fetch("SELECT guild_id, lang FROM guild_settings")
+    for r in rows[-_LANG_CACHE_MAX:]:
+        _lang_cache[int(r["guild_id"])] = (_NO_EXPIRY, str(r["lang"] or "de").lower())
+    return len(rows)
+
+
 async def get_guild_cfg(guild_id: int) -> dict:
     """
     Lädt (und initialisiert bei Bedarf) die Guild-Konfiguration.
@@ -125,4 +175,6 @@ async def update_guild_cfg(guild_id: int, **fields: Any):
         return  # nichts zu tun
 
     sql = f"UPDATE guild_settings SET {', '.join(set_parts)} WHERE guild_id=$1"
-    await execute(sql, *values)
\ No newline at end of file
+    await execute(sql, *values)
+    if "lang" in legacy_updates:
+        invalidate_guild_lang(guild_id)
\ No newline at end of file
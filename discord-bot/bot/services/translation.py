@@ -6,7 +6,7 @@ import asyncio
 import discord
 from typing import Optional, Dict
 
-from ..services.guild_config import get_guild_cfg
+from ..services.guild_config import get_guild_lang
 
 DEEPL_API_URL = "https://api-free.deepl.com/v2/translate"
 DEEPL_KEY = os.getenv("DEEPL_API_KEY")
@@ -88,14 +88,14 @@ async def de_to_en_static(text_de: str) -> str:
 async def translate_text_for_guild(guild_id: Optional[int], text_de: str) -> str:
     """
     Gibt den Text ggf. auf Englisch zurück, wenn guild.lang == 'en'.
+    Deutsche Guilds: sofort zurück (Sprache aus dem Cache, kein DB-/DeepL-Zugriff).
     """
     if not text_de or guild_id is None:
         return text_de
     try:
-        cfg = await get_guild_cfg(guild_id)
+        lang = await get_guild_lang(guild_id)
     except Exception:
         return text_de
-    lang = (cfg.get("lang") or "").lower()
     if lang == "en":
         return await translate_de_to_en(text_de)
     return text_de
@@ -108,10 +108,10 @@ async def translate_embed_for_guild(guild_id: int, embed: discord.Embed) -> disc
     if embed is None:
         return embed
     try:
-        cfg = await get_guild_cfg(guild_id)
+        lang = await get_guild_lang(guild_id)
     except Exception:
         return embed
-    if (cfg.get("lang") or "").lower() != "en":
+    if lang != "en":
         return embed
 
     # Titel & Beschreibung
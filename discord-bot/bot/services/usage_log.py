@@ -0,0 +1,173 @@
+# bot/services/usage_log.py
+from __future__ import annotations
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Optional
+
+from ..db import execute, get_pool, db_enabled
+
+log = logging.getLogger("ignix.usage")
+
+# Zeilen für public.output_usage werden gepuffert und gesammelt per COPY
+# geschrieben statt ein INSERT (= ein DB-Roundtrip) pro Bot-Nachricht.
+# Liegt in services/, damit usage.py UND replies.py ohne Zirkular-Import schreiben können.
+USAGE_COLUMNS = (
+    "ts", "guild_id", "channel_id", "user_id", "message_type",
+    "chars", "lang", "is_dm", "is_ephemeral",
+)
+FLUSH_INTERVAL = 1.0   # Sekunden
+FLUSH_MAX_ROWS = 500
+_QUEUE_MAX = 50_000    # Obergrenze, falls die DB länger nicht erreichbar ist
+
+_RETRY_DELAY = 0.5     # Sekunden bis zum zweiten Schreibversuch eines Batches
+_STOP_TIMEOUT = 30.0   # so lange darf der letzte Flush beim Stoppen dauern
+
+_queue: asyncio.Queue[tuple] = asyncio.Queue(maxsize=_QUEUE_MAX)
+_STOP = object()       # Sentinel: beendet _flush_loop, nachdem der aktuelle Batch geschrieben ist
+_flusher: Optional[asyncio.Task] = None
+
+_SQL_INSERT = """
+INSERT INTO public.output_usage
+    (ts, guild_id, channel_id, user_id, message_type, chars, lang, is_dm, is_ephemeral)
+VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
+"""
+
+
+async def _write(batch: list[tuple]) -> None:
+    # COPY ist atomar → ein zweiter Versuch kann keine Zeilen doppelt schreiben
+    for attempt in (1, 2):
+        try:
+            pool = await get_pool()
+            async with pool.acquire() as conn:
+                await conn.copy_records_to_table(
+                    "output_usage", schema_name="public", records=batch, columns=USAGE_COLUMNS,
+                )
+            log.debug("[INS] %s rows into output_usage", len(batch))
+            return
+        except Exception as e:
+            if attempt == 1:
+                log.warning("[ERR] usage flush failed (%s rows), retrying: %r", len(batch), e)
+                await asyncio.sleep(_RETRY_DELAY)
+                continue
+            # Logging darf den Bot nie aufhalten → Batch nach dem zweiten Fehlschlag verwerfen
+            log.exception("[ERR] usage flush failed again, dropping %s rows: %r", len(batch), e)
+
+
+def _drain(limit: int) -> tuple[list[tuple], bool]:
+    """Bis zu limit Zeilen ohne Warten holen; zweiter Wert: Stop-Sentinel gesehen."""
+    batch: list[tuple] = []
+    while len(batch) < limit:
+        try:
+            item = _queue.get_nowait()
+        except asyncio.QueueEmpty:
+            break
+        if item is _STOP:
+            return batch, True
+        batch.append(item)
+    return batch, False
+
+
+async def _flush_loop() -> None:
+    loop = asyncio.get_running_loop()
+    stop = False
+    while not stop:
+        item = await _queue.get()
+        if item is _STOP:
+            break
+        batch = [item]
+        deadline = loop.time() + FLUSH_INTERVAL
+        while len(batch) < FLUSH_MAX_ROWS:
+            more, stop = _drain(FLUSH_MAX_ROWS - len(batch))
+            batch.extend(more)
+            remaining = deadline - loop.time()
+            if stop or len(batch) >= FLUSH_MAX_ROWS or remaining <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(_queue.get(), remaining)
+            except asyncio.TimeoutError:
+                break
+            if item is _STOP:
+                stop = True
+                break
+            batch.append(item)
+        # Auch beim Stoppen den aktuellen Batch noch schreiben
+        await _write(batch)
+
+
+def start_usage_flusher() -> None:
+    """Startet den Hintergrund-Task (idempotent)."""
+    global _flusher
+    if _flusher is None or _flusher.done():
+        _flusher = asyncio.create_task(_flush_loop())
+
+
+async def flush_usage() -> None:
+    """Schreibt alle aktuell gepufferten Zeilen sofort."""
+    while True:
+        batch, stop = _drain(FLUSH_MAX_ROWS)
+        if stop:
+            # Sentinel gehört dem Flush-Loop → zurücklegen (Queue wurde gerade geleert)
+            _queue.put_nowait(_STOP)
+        if batch:
+            await _write(batch)
+        if stop or not batch:
+            return
+
+
+async def stop_usage_flusher() -> None:
+    """
+    Beendet den Hintergrund-Task per Sentinel statt cancel(): der Loop schreibt seinen
+    gerade gesammelten Batch noch, danach wird der Rest des Puffers geschrieben.
+    """
+    global _flusher
+    task, _flusher = _flusher, None  # neue Zeilen gehen ab jetzt direkt per INSERT
+    if task is not None and not task.done():
+        await _queue.put(_STOP)
+        try:
+            await asyncio.wait_for(task, _STOP_TIMEOUT)
+        except asyncio.TimeoutError:
+            log.warning("[ERR] usage flusher did not stop within %ss, cancelled", _STOP_TIMEOUT)
+    await flush_usage()
+
+
+def _row(guild_id, channel_id, user_id, message_type, chars, lang, is_dm, is_ephemeral) -> tuple:
+    ts = datetime.now(timezone.utc)
+    return (ts, guild_id, channel_id, user_id, message_type, int(chars), lang, bool(is_dm), bool(is_ephemeral))
+
+
+async def insert_usage(
+    guild_id: Optional[int],
+    channel_id: Optional[int],
+    user_id: Optional[int],
+    message_type: str,
+    chars: int,
+    lang: str,
+    is_dm: bool,
+    is_ephemeral: bool,
+) -> None:
+    """Eine output_usage-Zeile sofort (ungepuffert) schreiben, z. B. für /usage_diag."""
+    await execute(_SQL_INSERT, *_row(guild_id, channel_id, user_id, message_type, chars, lang, is_dm, is_ephemeral))
+
+
+async def log_usage(
+    guild_id: Optional[int],
+    channel_id: Optional[int],
+    user_id: Optional[int],
+    message_type: str,
+    chars: int,
+    lang: str,
+    is_dm: bool,
+    is_ephemeral: bool,
+) -> None:
+    """Eine output_usage-Zeile erfassen (gepuffert, ohne Flusher direkt per INSERT)."""
+    if not db_enabled():
+        return  # DB optional → Usage-Logging entfällt still
+    row = _row(guild_id, channel_id, user_id, message_type, chars, lang, is_dm, is_ephemeral)
+    if _flusher is None or _flusher.done():
+        await execute(_SQL_INSERT, *row)
+        return
+    try:
+        _queue.put_nowait(row)
+    except asyncio.QueueFull:
+        log.warning("[ERR] usage buffer full, dropping row (gid=%s cid=%s)", guild_id, channel_id)
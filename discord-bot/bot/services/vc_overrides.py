@@ -0,0 +1,57 @@
+# bot/services/vc_overrides.py
+from __future__ import annotations
+import time
+from typing import Dict, Optional, Tuple
+
+from ..db import fetchrow
+
+# vc_overrides ändert sich selten, on_voice_state_update feuert dagegen bei jedem
+# Join/Leave → Config pro (guild_id, channel_id) kurz cachen, auch "kein Override" (None).
+# Schreibende Commands (/set_vc_override, /disable) invalidieren sofort.
+_OVERRIDE_TTL = 60.0
+
+# (override_ids, target_ids) – bereits geparst
+VcOverride = Tuple[frozenset, Tuple[int, ...]]
+_override_cache: Dict[Tuple[int, int], Tuple[float, Optional[VcOverride]]] = {}
+
+
+def _to_list(raw) -> list:
+    """JSONB-Spalte → Liste (dekodiert bereits der Treiber-Codec in db.py)."""
+    return raw if isinstance(raw, list) else []
+
+
+async def get_vc_override(guild_id: int, channel_id: int) -> Optional[VcOverride]:
+    """Override-/Ziel-Rollen für den Channel oder None (kein bzw. unvollständiges Override)."""
+    key = (guild_id, channel_id)
+    now = time.monotonic()
+    hit = _override_cache.get(key)
+    if hit is not None and now - hit[0] < _OVERRIDE_TTL:
+        return hit[1]
+
+    row = await fetchrow(
+        """
+        SELECT override_roles, target_roles
+          FROM vc_overrides
+         WHERE guild_id   = $1
+           AND channel_id = $2
+        """,
+        guild_id,
+        channel_id,
+    )
+    value: Optional[VcOverride] = None
+    if row:
+        override_ids = frozenset(int(r) for r in _to_list(row["override_roles"]))
+        target_ids = tuple(int(r) for r in _to_list(row["target_roles"]))
+        if override_ids and target_ids:
+            value = (override_ids, target_ids)
+    _override_cache[key] = (now, value)
+    return value
+
+
+def invalidate_vc_override(guild_id: int, channel_id: Optional[int] = None) -> None:
+    """Cache-Eintrag eines Channels bzw. (ohne channel_id) aller Channels der Guild verwerfen."""
+    if channel_id is not None:
+        _override_cache.pop((guild_id, channel_id), None)
+        return
+    for key in [k for k in _override_cache if k[0] == guild_id]:
+        del _override_cache[key]
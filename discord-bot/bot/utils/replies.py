@@ -6,38 +6,21 @@ from .timeutil import translate_embed
 from ..services.translation import translate_text_for_guild
 
 # ─── Usage-Logging (lokal, um Zirkular-Import zu vermeiden) ────────────────
-from ..db import execute
-from ..services.guild_config import get_guild_cfg
-
-def _safe_len(s: Optional[str]) -> int:
-    return len(s or "")
-
-def _count_embed_chars(embed: discord.Embed) -> int:
-    n = 0
-    n += _safe_len(embed.title)
-    n += _safe_len(embed.description)
-    if embed.footer and getattr(embed.footer, "text", None):
-        n += _safe_len(embed.footer.text)
-    if embed.author and getattr(embed.author, "name", None):
-        n += _safe_len(embed.author.name)
-    for f in (embed.fields or []):
-        n += _safe_len(f.name)
-        n += _safe_len(f.value)
-    return n
+from ..services.guild_config import get_guild_lang
+from ..services.usage_log import log_usage
 
 def _total_message_chars(content: Optional[str], embeds: Iterable[discord.Embed] | None) -> int:
-    total = _safe_len(content)
+    total = len(content) if content else 0
     if embeds:
-        for e in embeds:
-            total += _count_embed_chars(e)
+        # Embed.__len__ zählt Titel, Beschreibung, Felder, Footer-Text und Autor-Namen
+        total += sum(map(len, embeds))
     return total
 
 async def _guild_lang(guild_id: Optional[int]) -> str:
     if not guild_id:
         return "dm"
     try:
-        cfg = await get_guild_cfg(guild_id)
-        lang = str(cfg.get("lang") or "de").lower()
+        lang = await get_guild_lang(guild_id)  # TTL-Cache, DB nur bei Miss
         return lang if lang in {"de", "en"} else "de"
     except Exception:
         return "de"
@@ -54,10 +37,12 @@ async def log_interaction_output(
     Ephemeral-/Interaction-Antwort protokollieren (wird nicht von on_message erfasst).
     Nur EIN Insert pro tatsächlichem Send.
     """
+    if not content and embed is None and not embeds:
+        return  # nichts Sichtbares → weder zählen noch Sprache nachschlagen
     try:
         if embeds is None and embed is not None:
             embeds = [embed]
-        chars = _total_message_chars(content, embeds or [])
+        chars = _total_message_chars(content, embeds)
         if chars <= 0:
             return
 
@@ -66,17 +51,12 @@ async def log_interaction_output(
         user_id = inter.user.id if inter.user else None
         lang = await _guild_lang(guild_id)
 
-        await execute(
-            """
-            INSERT INTO public.output_usage
-                (ts, guild_id, channel_id, user_id, message_type, chars, lang, is_dm, is_ephemeral)
-            VALUES (now(), $1, $2, $3, $4, $5, $6, $7, $8)
-            """,
+        await log_usage(
             guild_id,
             channel_id,
             user_id,
             message_type,
-            int(chars),
+            chars,
             lang,
             False,   # Interactions sind keine DMs
             True,    # hier: speziell ephemeral